@@ -0,0 +1,27 @@
+# benchmarks/corpus.py
+import json
+import os
+from typing import List, Tuple
+
+from python_gobang.board import Board
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(__file__), 'corpus_v1.json')
+
+
+def load_corpus(path: str = DEFAULT_CORPUS) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def build_position(corpus: dict, position: dict) -> Tuple[Board, int]:
+    """Replay a corpus position; return the board and the player to move."""
+    board = Board(corpus['size'])
+    player = 1
+    for x, y in position['moves']:
+        board.place_piece(x, y, player)
+        player = 3 - player
+    return board, player
+
+
+def positions(corpus: dict, category: str = None) -> List[dict]:
+    return [p for p in corpus['positions'] if category is None or p['category'] == category]
@@ -0,0 +1,256 @@
+# benchmarks/runner.py
+"""Benchmark runner.
+
+    python -m benchmarks --out results.json
+    python -m benchmarks --baseline benchmarks/baseline.json
+
+Times ``AI.get_move`` for every difficulty on every corpus position,
+the HARD search rate in nodes per second, the MCTS rollout rate in
+playouts per second, and the board and search
+primitives on their own. Results are written as JSON. With
+``--baseline``, every timing is compared against a saved run and the
+exit status is 1 if any regressed by more than ``--tolerance``.
+"""
+import argparse
+import io
+import json
+import platform
+import random
+import sys
+import time
+from typing import Callable, Dict, List
+
+from python_gobang.ai import AI, Difficulty
+from python_gobang.board import Board
+from python_gobang.console_ui import ConsoleUI
+from python_gobang.heatmap import threat_heatmaps
+from python_gobang.move import Move
+
+from .corpus import DEFAULT_CORPUS, build_position, load_corpus
+
+
+# Playouts per MCTS move, fixed so its latency is comparable between runs
+MCTS_PLAYOUTS = 1024
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of `values` (q in 0-100)."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def bench_latency(corpus: dict, difficulty: Difficulty, repeats: int,
+                  seed: int) -> dict:
+    """get_move latency over the corpus, in milliseconds."""
+    times = []
+    nodes = playouts = 0
+    search_time = 0.0
+    budget = MCTS_PLAYOUTS if difficulty == Difficulty.MCTS else None
+    for position in corpus['positions']:
+        for i in range(repeats):
+            board, player = build_position(corpus, position)
+            ai = AI(difficulty, player=player)
+            random.seed(seed + i)
+            start = time.perf_counter()
+            ai.get_move(board, node_budget=budget)
+            elapsed = time.perf_counter() - start
+            times.append(elapsed * 1000)
+            nodes += ai.nodes
+            if ai.mcts is not None:
+                playouts += ai.mcts.playouts
+            search_time += elapsed
+
+    result = {
+        'moves': len(times),
+        'mean_ms': sum(times) / len(times),
+        'p50_ms': percentile(times, 50),
+        'p95_ms': percentile(times, 95),
+        'p99_ms': percentile(times, 99),
+    }
+    if difficulty == Difficulty.HARD:
+        result['nodes'] = nodes
+        result['nodes_per_second'] = nodes / search_time
+    elif difficulty == Difficulty.MCTS:
+        result['playouts'] = playouts
+        result['playouts_per_second'] = playouts / search_time
+    return result
+
+
+def _time_per_call(fn: Callable[[], None], min_seconds: float) -> float:
+    """Microseconds per call of `fn`, repeating for at least `min_seconds`."""
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return elapsed / calls * 1e6
+
+
+def bench_primitives(corpus: dict, min_seconds: float) -> Dict[str, float]:
+    """Microseconds per call of the board and search primitives."""
+    totals: Dict[str, float] = {}
+    boards = [build_position(corpus, p) + (p,) for p in corpus['positions']]
+    for board, player, position in boards:
+        ai = AI(Difficulty.HARD, player=player)
+        x, y = position['moves'][-1]
+        last = Move(x, y, 3 - player)
+        cx, cy = next(iter(sorted(board.frontier(1))))
+
+        def place_remove():
+            board.place_piece(cx, cy, player)
+            board.remove_piece(cx, cy)
+
+        def minimax():
+            ai.tt.clear()
+            ai._start_search(None, None)
+            ai._negamax(board, 2, player, float('-inf'), float('inf'))
+
+        cases = {
+            'check_win': lambda: board.check_win(last),
+            'winning_cells': lambda: board.winning_cells(player),
+            'place_remove': place_remove,
+            'get_neighbor_moves': lambda: ai._get_neighbor_moves(board, radius=2),
+            'evaluate_board': lambda: ai._evaluate_board(board),
+            'threat_heatmaps': lambda: threat_heatmaps(board.grid),
+            'minimax_depth2': minimax,
+        }
+        for name, fn in cases.items():
+            totals[name] = totals.get(name, 0.0) + _time_per_call(fn, min_seconds)
+
+    return {f'{name}_us': total / len(boards) for name, total in totals.items()}
+
+
+def bench_render(min_seconds: float, sizes=(15, 19)) -> Dict[str, float]:
+    """Microseconds per ConsoleUI frame, full and differential, by board size.
+
+    Frames are written to an in-memory stream. The differential case
+    alternates placing and removing one stone, so each frame redraws a
+    single cell.
+    """
+    results = {}
+    rng = random.Random(0)
+    for size in sizes:
+        board = Board(size)
+        cells = rng.sample([(x, y) for x in range(size) for y in range(size)],
+                           size * size // 3)
+        for k, (x, y) in enumerate(cells):
+            board.place_piece(x, y, 1 + k % 2)
+        cx, cy = next((x, y) for x in range(size) for y in range(size)
+                      if board.is_valid_move(x, y))
+        full = ConsoleUI(out=io.StringIO())
+        diff = ConsoleUI(differential=True, out=io.StringIO())
+        diff.display_board(board)
+
+        def full_frame():
+            full.out.seek(0)
+            full.display_board(board)
+
+        def diff_frame():
+            diff.out.seek(0)
+            if board.get_cell(cx, cy):
+                board.remove_piece(cx, cy)
+            else:
+                board.place_piece(cx, cy, 1)
+            diff.display_board(board)
+
+        results[f'full_{size}_us'] = _time_per_call(full_frame, min_seconds)
+        results[f'differential_{size}_us'] = _time_per_call(diff_frame, min_seconds)
+    return results
+
+
+def run(corpus_path: str = DEFAULT_CORPUS, repeats: int = 3, seed: int = 0,
+        min_seconds: float = 0.05) -> dict:
+    corpus = load_corpus(corpus_path)
+    random.seed(seed)
+    return {
+        'meta': {
+            'corpus_version': corpus['version'],
+            'positions': len(corpus['positions']),
+            'repeats': repeats,
+            'seed': seed,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        },
+        'latency': {d.name: bench_latency(corpus, d, repeats, seed) for d in Difficulty},
+        'primitives': bench_primitives(corpus, min_seconds),
+        'render': bench_render(min_seconds),
+    }
+
+
+def _timings(results: dict) -> Dict[str, float]:
+    """Flatten the comparable metrics to {'section.name.metric': value}."""
+    flat = {}
+    for difficulty, stats in results['latency'].items():
+        for metric, value in stats.items():
+            if metric.endswith('_ms') or metric.endswith('_per_second'):
+                flat[f'latency.{difficulty}.{metric}'] = value
+    for metric, value in results['primitives'].items():
+        flat[f'primitives.{metric}'] = value
+    for metric, value in results.get('render', {}).items():
+        flat[f'render.{metric}'] = value
+    return flat
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Describe every metric that is more than `tolerance` worse than baseline."""
+    regressions = []
+    current, previous = _timings(results), _timings(baseline)
+    for name, old in sorted(previous.items()):
+        new = current.get(name)
+        if new is None or not old:
+            continue
+        # Rates should not drop; times should not grow
+        change = (old - new) / old if name.endswith('_per_second') else (new - old) / old
+        if change > tolerance:
+            regressions.append(f"{name}: {old:.4g} -> {new:.4g} ({change:+.0%} worse)")
+    return regressions
+
+
+def _print_summary(results: dict) -> None:
+    for difficulty, stats in results['latency'].items():
+        line = (f"{difficulty:<7} p50 {stats['p50_ms']:8.2f}ms  p95 {stats['p95_ms']:8.2f}ms"
+                f"  p99 {stats['p99_ms']:8.2f}ms")
+        if 'nodes_per_second' in stats:
+            line += f"  {stats['nodes_per_second']:.0f} nodes/s"
+        if 'playouts_per_second' in stats:
+            line += f"  {stats['playouts_per_second']:.0f} playouts/s"
+        print(line)
+    for name, value in results['primitives'].items():
+        print(f"{name:<24} {value:10.2f}")
+    for name, value in results.get('render', {}).items():
+        print(f"render_{name:<17} {value:10.2f}")
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description="Benchmark the Gobang AI.")
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS)
+    parser.add_argument('--repeats', type=int, default=3,
+                        help="get_move calls per position and difficulty")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--min-seconds', type=float, default=0.05,
+                        help="Minimum timing window per primitive and position")
+    parser.add_argument('--out', help="Write results as JSON to this file")
+    parser.add_argument('--baseline', help="Compare against a saved results file")
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help="Allowed slowdown before a metric is flagged (0.15 = 15%%)")
+    args = parser.parse_args(argv)
+
+    results = run(args.corpus, args.repeats, args.seed, args.min_seconds)
+    _print_summary(results)
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline}")
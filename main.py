@@ -1,8 +1,15 @@
 #!/usr/bin/env python3
 # src/python_gobang/main.py
-from python_gobang.game import Game
+import sys
 
 def main():
+    # Imported here so that engine mode never loads the console UI
+    if '--engine' in sys.argv[1:]:
+        from python_gobang.engine import main as engine_main
+        engine_main()
+        return
+
+    from python_gobang.game import Game
     try:
         game = Game()
         game.start_game()
@@ -10,4 +17,4 @@ def main():
         print("\nGame interrupted. Thanks for playing!")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,32 +1,162 @@
 # src/python_gobang/ai.py
 import random
+import threading
+import time
 from enum import Enum, auto
-from typing import Tuple, Optional
-import numpy as np
-from .board import Board
+from typing import TYPE_CHECKING, Callable, Dict, List, Tuple, Optional
+from .board import Board, THREE_PATTERNS
+from .evaluator import PATTERN_SCORES
+from .search_stats import SearchStats
+from .threat_search import ThreatSolver
+from .transposition import Bound, TranspositionTable
+
+# Imported where used, to keep `import python_gobang.ai` quick for
+# short-lived engine processes
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+    from .mcts import MCTS
+    from .opening_book import OpeningBook
 
 
 class Difficulty(Enum):
     EASY = auto()
     MEDIUM = auto()
     HARD = auto()
+    MCTS = auto()
+
+
+class SearchAborted(Exception):
+    """Raised inside the search when the move's time or node budget runs out."""
 
 
 class AI:
     """AI opponent with different difficulty strategies."""
 
-    def __init__(self, difficulty: Difficulty, player: int = 2):
+    # Plies searched below each root candidate by _hard_move
+    HARD_DEPTH = 3
+    # Deepest iteration _hard_move will start when it has a budget
+    MAX_DEPTH = 8
+    # Moves searched at each interior node of _negamax
+    BREADTH = 10
+    # Plies of forcing moves _quiesce searches past the nominal depth, how
+    # many per node, and for how many plies open threes count as forcing
+    # besides fours
+    QUIESCENCE_DEPTH = 4
+    QUIESCENCE_BREADTH = 8
+    QUIESCENCE_THREE_PLIES = 1
+    # Half-width of the root window around the score of the last
+    # iteration with the same side to move; a result outside it is re-searched
+    ASPIRATION_WINDOW = 500
+    # Seconds the threat solver may spend on one HARD move, over all its
+    # queries; the move's own time budget can cut it shorter
+    THREAT_TIME = 1.0
+    _WIN_SCORE = 1000000
+
+    def __init__(self, difficulty: Difficulty, player: int = 2,
+                 tt_size: int = 1 << 16, time_budget: Optional[float] = None,
+                 node_budget: Optional[int] = None, workers: int = 1,
+                 collect_stats: bool = False, book: Optional['OpeningBook'] = None):
         self.difficulty = difficulty
         self.player = player  # AI's piece (default white=2)
         self.opponent = 3 - player
-
-    def get_move(self, board: Board) -> Tuple[int, int]:
-        if self.difficulty == Difficulty.EASY:
-            return self._easy_move(board)
-        elif self.difficulty == Difficulty.MEDIUM:
-            return self._medium_move(board)
-        else:
-            return self._hard_move(board)
+        # Kept for the whole game so later moves reuse earlier searches
+        self.tt = TranspositionTable(tt_size)
+        # Move ordering state for _negamax: two killer moves per ply and a
+        # history score per (player, cell), raised on beta cutoffs
+        self._killers: List[List[Optional[Tuple[int, int]]]] = []
+        self._history = {1: {}, 2: {}}
+        self.threats = ThreatSolver()
+        # Default per-move HARD budgets (seconds / search nodes); without
+        # either, HARD deepens up to HARD_DEPTH
+        self.time_budget = time_budget
+        self.node_budget = node_budget
+        self.nodes = 0
+        self._deadline: Optional[float] = None
+        self._node_limit: Optional[int] = None
+        self._cancel: Optional[threading.Event] = None
+        # HARD splits its root candidates over this many processes when > 1
+        self.workers = workers
+        self._pool: Optional['ProcessPoolExecutor'] = None
+        # Instrumentation, all off by default. `stats` holds the last
+        # move's SearchStats when collect_stats is set; `profiler` (e.g. a
+        # cProfile.Profile) is enabled only while a move is searched;
+        # `search_callback(ai, move, stats)` runs after every move.
+        self.collect_stats = collect_stats
+        self.stats: Optional[SearchStats] = None
+        self._stats: Optional[SearchStats] = None  # Of the search under way
+        self.profiler = None
+        self.search_callback: Optional[Callable] = None
+        # HARD plays book moves without searching while the book has one
+        self.book = book
+        # MCTS search tree, created on the first MCTS move and kept so
+        # later moves reuse it
+        self.mcts: Optional['MCTS'] = None
+
+    def close(self) -> None:
+        """Shut down the worker processes used by a parallel HARD search."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def get_move(self, board: Board, time_budget: Optional[float] = None,
+                 node_budget: Optional[int] = None,
+                 cancel: Optional[threading.Event] = None) -> Tuple[int, int]:
+        """Pick the AI's next move.
+
+        `time_budget` and `node_budget` override the instance defaults for
+        this move only; they bound the HARD search, and for MCTS the node
+        budget counts playouts. Setting `cancel` from
+        another thread stops the search as if its budget had run out.
+        """
+        move, stats = self.search_move(board, time_budget, node_budget, cancel)
+        self.stats = stats
+        if self.search_callback is not None:
+            self.search_callback(self, move, stats)
+        return move
+
+    def search_move(self, board: Board, time_budget: Optional[float] = None,
+                    node_budget: Optional[int] = None,
+                    cancel: Optional[threading.Event] = None
+                    ) -> Tuple[Tuple[int, int], Optional[SearchStats]]:
+        """(move, stats) as get_move finds them, but without setting
+        `stats` or running `search_callback`, for searches whose move may
+        never be played."""
+        self.tt.new_search()
+        self._new_ordering()
+        self._start_search(
+            self.time_budget if time_budget is None else time_budget,
+            self.node_budget if node_budget is None else node_budget, cancel)
+        self._stats = SearchStats() if self.collect_stats else None
+        tt_hits, tt_misses = self.tt.hits, self.tt.misses
+
+        if self.profiler is not None:
+            self.profiler.enable()
+        try:
+            if self.difficulty == Difficulty.EASY:
+                move = self._easy_move(board)
+            elif self.difficulty == Difficulty.MEDIUM:
+                move = self._medium_move(board)
+            elif self.difficulty == Difficulty.MCTS:
+                move = self._mcts_move(board, time_budget, node_budget, cancel)
+            else:
+                move = self.book.lookup(board) if self.book is not None else None
+                if move is None:
+                    move = self._hard_move(board)
+        finally:
+            if self.profiler is not None:
+                self.profiler.disable()
+
+        stats = self._stats
+        if stats is not None:
+            stats.finish(self.tt.hits - tt_hits, self.tt.misses - tt_misses)
+        return move, stats
+
+    def _start_search(self, time_budget: Optional[float], node_budget: Optional[int],
+                      cancel: Optional[threading.Event] = None) -> None:
+        self.nodes = 0
+        self._deadline = None if time_budget is None else time.perf_counter() + time_budget
+        self._node_limit = node_budget
+        self._cancel = cancel
 
     # ----------------------------------------------------------------
     # Easy: random move, but will win or block immediate 5-in-a-row
@@ -48,9 +178,9 @@ class AI:
             return random.choice(neighbors)
 
         # Fallback: center or random
-        center = board.size // 2
-        if board.is_valid_move(center, center):
-            return center, center
+        center = board.center()
+        if board.is_valid_move(*center):
+            return center
         return self._random_move(board)
 
     # ----------------------------------------------------------------
@@ -61,12 +191,11 @@ class AI:
         best_moves = []
         candidates = self._get_neighbor_moves(board, radius=2)
         if not candidates:
-            center = board.size // 2
-            return center, center
+            return board.center()
 
+        heat = self._threat_scores(board, candidates, own_weight=1.1)
         for x, y in candidates:
-            score = self._evaluate_position(board, x, y, self.player) * 1.1 + \
-                    self._evaluate_position(board, x, y, self.opponent)
+            score = heat[x, y]
             if score > best_score:
                 best_score = score
                 best_moves = [(x, y)]
@@ -76,230 +205,607 @@ class AI:
         return random.choice(best_moves)
 
     # ----------------------------------------------------------------
-    # Hard: minimax with alpha-beta pruning
+    # MCTS: UCT with batched random rollouts (see mcts.py)
+    # ----------------------------------------------------------------
+    def _mcts_move(self, board: Board, time_budget: Optional[float],
+                   playouts: Optional[int],
+                   cancel: Optional[threading.Event]) -> Tuple[int, int]:
+        if self.mcts is None:
+            from .mcts import MCTS
+            self.mcts = MCTS(self.player)
+        return self.mcts.search(
+            board, self.time_budget if time_budget is None else time_budget,
+            self.node_budget if playouts is None else playouts, cancel)
+
+    # ----------------------------------------------------------------
+    # Hard: principal-variation search (negamax with alpha-beta pruning)
     # ----------------------------------------------------------------
     def _hard_move(self, board: Board) -> Tuple[int, int]:
         candidates = self._get_neighbor_moves(board, radius=2)
         if not candidates:
-            center = board.size // 2
-            return center, center
+            return board.center()
+
+        # Forced lines first: threat-space search is far cheaper than
+        # reaching the same depth with _negamax
+        threat_deadline = time.perf_counter() + self.THREAT_TIME
+        if self._deadline is not None:
+            threat_deadline = min(threat_deadline, self._deadline)
+        forced, opponent_vcf = self._forced_move(board, threat_deadline)
+        if forced is not None:
+            return forced
 
         # Pre-sort candidates by greedy score for better pruning
-        scored = []
-        for x, y in candidates:
-            s = self._evaluate_position(board, x, y, self.player) * 1.1 + \
-                self._evaluate_position(board, x, y, self.opponent)
-            scored.append((s, x, y))
+        heat = self._threat_scores(board, candidates, own_weight=1.1)
+        scored = [(heat[x, y], x, y) for x, y in candidates]
         scored.sort(reverse=True)
         # Limit search breadth
         candidates = [(x, y) for _, x, y in scored[:15]]
+        if opponent_vcf is not None:
+            candidates = self._vcf_defences(board, opponent_vcf, candidates,
+                                            threat_deadline)
+
+        budgeted = self._deadline is not None or self._node_limit is not None
+        max_depth = self.MAX_DEPTH if budgeted else self.HARD_DEPTH
+
+        # Iterative deepening: keep the result of the last finished
+        # iteration and search its best move first in the next one
+        best_move = candidates[0]
+        scores: List[float] = []
+        for depth in range(max_depth + 1):
+            try:
+                if self.workers > 1 and len(candidates) > 1:
+                    best_move, best_score = self._search_root_parallel(
+                        board, candidates, depth)
+                else:
+                    # Scores swing with the side to move at the horizon, so
+                    # the window is centred on the iteration before last
+                    previous = scores[-2] if len(scores) >= 2 else None
+                    best_move, best_score = self._search_root_aspirated(
+                        board, candidates, depth, previous)
+            except SearchAborted:
+                break
+            scores.append(best_score)
+            if self._stats is not None:
+                self._stats.iteration_done(depth, best_move, best_score)
+            candidates.remove(best_move)
+            candidates.insert(0, best_move)
+            if abs(best_score) >= self._WIN_SCORE:
+                break  # Forced result; deeper search can't change it
 
+        return best_move
+
+    def _forced_move(self, board: Board, deadline: float):
+        """(move, opponent_vcf): win now, block a four, or start a forced
+        win found by the threat solver, else None; and the first move of
+        the opponent's VCF, if the solver looked for one and found it.
+
+        The solver queries all stop at `deadline`.
+        """
+        wins = board.winning_cells(self.player)
+        if wins:
+            return board.cells_of(wins)[0], None
+        blocks = board.winning_cells(self.opponent)
+        if blocks:
+            return board.cells_of(blocks)[0], None
+        move = self.threats.find_vcf(board, self.player, deadline)
+        if move is not None:
+            return move, None
+        opponent_vcf = self.threats.find_vcf(board, self.opponent, deadline)
+        if opponent_vcf is None:
+            move = self.threats.find_vct(board, self.player, deadline)
+        return move, opponent_vcf
+
+    def _vcf_defences(self, board: Board, opponent_vcf: Tuple[int, int],
+                      candidates: List[Tuple[int, int]],
+                      deadline: float) -> List[Tuple[int, int]]:
+        """Keep the candidates after which the opponent has no VCF left.
+
+        The opponent's first VCF move is always tried. If nothing refutes
+        the VCF, all candidates are kept and the search picks the best
+        of a lost position. Candidates not checked by `deadline` are kept.
+        """
+        if opponent_vcf not in candidates:
+            candidates = [opponent_vcf] + candidates
+        defences = []
+        for i, (x, y) in enumerate(candidates):
+            if time.perf_counter() >= deadline:
+                defences += candidates[i:]
+                break
+            board.make_move(x, y, self.player)
+            try:
+                if self.threats.find_vcf(board, self.opponent, deadline) is None:
+                    defences.append((x, y))
+            finally:
+                board.undo_move()
+        return defences or candidates
+
+    def _search_root_aspirated(self, board: Board, candidates, depth: int,
+                               previous: Optional[float]):
+        """_search_root in a window of ASPIRATION_WINDOW around `previous`,
+        searched again with a full window if the score falls outside it."""
+        if previous is None or abs(previous) >= self._WIN_SCORE:
+            return self._search_root(board, candidates, depth)
+        alpha = previous - self.ASPIRATION_WINDOW
+        beta = previous + self.ASPIRATION_WINDOW
+        move, score = self._search_root(board, candidates, depth, alpha, beta)
+        if alpha < score < beta:
+            return move, score
+        return self._search_root(board, candidates, depth)
+
+    def _search_root(self, board: Board, candidates, depth: int,
+                     alpha: float = float('-inf'), beta: float = float('inf')):
+        """Search each root candidate `depth` plies deep; return (move, score).
+
+        The move returned is the first one with the highest score. After
+        the first candidate, each is searched with a null window and only
+        re-searched if it beats the best so far. Moves scoring at or below
+        `alpha` only get an upper bound, and the search stops at the first
+        one reaching `beta`.
+        """
         best_score = float('-inf')
         best_move = candidates[0]
-        alpha = float('-inf')
-        beta = float('inf')
 
         for x, y in candidates:
-            board.grid[x, y] = self.player
-            score = self._minimax(board, depth=3, is_maximizing=False,
-                                  alpha=alpha, beta=beta)
-            board.grid[x, y] = board.EMPTY
+            board.make_move(x, y, self.player)
+            try:
+                score = self._search_child(board, depth, self.opponent, alpha, beta,
+                                           best_score == float('-inf'))
+            finally:
+                board.undo_move()
 
             if score > best_score:
                 best_score = score
                 best_move = (x, y)
             alpha = max(alpha, score)
+            if alpha >= beta:
+                break
 
-        return best_move
+        return best_move, best_score
+
+    def _search_root_parallel(self, board: Board, candidates, depth: int):
+        """_search_root with the candidates after the first split over workers.
+
+        The first candidate is searched here and its score, less one,
+        becomes every worker's alpha. Scores are whole numbers, so a move
+        that ties the best is still scored exactly and the result is the
+        first best move in candidate order, however the workers are
+        scheduled.
+        """
+        first = candidates[0]
+        _, first_score = self._search_root(board, [first], depth)
+        if self._pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+
+        rest = candidates[1:]
+        chunks = [rest[i::self.workers] for i in range(min(self.workers, len(rest)))]
+        time_left = (None if self._deadline is None
+                     else max(0.0, self._deadline - time.perf_counter()))
+        node_share = (None if self._node_limit is None
+                      else max(0, self._node_limit - self.nodes) // len(chunks))
+        futures = [self._pool.submit(_search_root_chunk, type(board), board.snapshot(),
+                                     self.player, chunk, depth, first_score - 1,
+                                     time_left, node_share)
+                   for chunk in chunks]
+
+        results = [(0, first_score)]
+        for future in futures:
+            move, score, nodes = future.result()  # Re-raises SearchAborted
+            self.nodes += nodes
+            results.append((candidates.index(move), score))
+        index, score = min(results, key=lambda r: (-r[1], r[0]))
+        return candidates[index], score
+
+    def _search_child(self, board: Board, depth: int, mover: int, alpha: float,
+                      beta: float, full: bool, ply: int = 1) -> float:
+        """Score of the move just made, from the side that made it.
+
+        `mover` is to move next. Unless `full` is set the move first gets
+        a null window just above `alpha`, which is enough to show it is no
+        better, and the full (alpha, beta) window only if it is.
+        """
+        if not full and alpha != float('-inf'):
+            score = -self._negamax(board, depth, mover, -alpha - 1, -alpha, ply)
+            if not alpha < score < beta:
+                return score
+        return -self._negamax(board, depth, mover, -beta, -alpha, ply)
+
+    def _negamax(self, board: Board, depth: int, mover: int,
+                 alpha: float, beta: float, ply: int = 1) -> float:
+        """Score of the position for `mover`, who is to move, `depth` plies deep."""
+        if depth <= 0:
+            return self._quiesce(board, mover, alpha, beta, self.QUIESCENCE_DEPTH)
+        self.nodes += 1
+        if (self._deadline is not None or self._node_limit is not None
+                or self._cancel is not None):
+            self._check_budget()
+        stats = self._stats
+        if stats is not None:
+            stats.enter_node(depth)
+
+        key = board.hash << 1 | (mover == self.player)
+        entry = self.tt.probe(key)
+        hint = None
+        if entry is not None:
+            if entry.depth >= depth:
+                if entry.bound is Bound.EXACT:
+                    return entry.score
+                if entry.bound is Bound.LOWER:
+                    alpha = max(alpha, entry.score)
+                else:
+                    beta = min(beta, entry.score)
+                if beta <= alpha:
+                    return entry.score
+            hint = entry.best_move
+        alpha_orig, beta_orig = alpha, beta
+
+        # Five-in-a-row threats decide the node without ordering: the side
+        # to move wins if it can, and otherwise must block
+        other = 3 - mover
+        if board.winning_cells(mover):
+            self.tt.store(key, depth, self._WIN_SCORE, Bound.EXACT, None)
+            return self._WIN_SCORE
+        blocks = board.winning_cells(other)
+
+        if stats is not None:
+            started = time.perf_counter()
+        if blocks:
+            candidates = board.cells_of(blocks)
+        else:
+            candidates = self._get_neighbor_moves(board, radius=1)
+        if stats is not None:
+            stats.add_time('movegen', started)
+        if not candidates:
+            return self._evaluate_for(board, mover)
+
+        if stats is not None:
+            started = time.perf_counter()
+        candidates = self._order_moves(board, candidates, mover, ply, hint)
+        if stats is not None:
+            stats.add_time('ordering', started)
+
+        # No candidate completes five (checked above), so none needs a win check
+        best = float('-inf')
+        best_move = None
+        searched = 0
+        for x, y in candidates:
+            board.make_move(x, y, mover)
+            try:
+                score = self._search_child(board, depth - 1, other, alpha, beta,
+                                           searched == 0, ply + 1)
+            finally:
+                board.undo_move()
+            searched += 1
+            if score > best:
+                best = score
+                best_move = (x, y)
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                self._record_cutoff(best_move, mover, depth, ply)
+                break
 
-    def _minimax(self, board: Board, depth: int, is_maximizing: bool,
-                 alpha: float, beta: float) -> float:
-        # Terminal check
-        if depth == 0:
-            return self._evaluate_board(board)
+        if stats is not None:
+            stats.expanded(depth, searched, alpha >= beta)
+
+        if best <= alpha_orig:
+            bound = Bound.UPPER
+        elif best >= beta_orig:
+            bound = Bound.LOWER
+        else:
+            bound = Bound.EXACT
+        self.tt.store(key, depth, best, bound, best_move)
+        return best
+
+    def _quiesce(self, board: Board, mover: int, alpha: float, beta: float,
+                 depth: int) -> float:
+        """Score of a horizon position for `mover`, following forcing moves.
+
+        `mover` may stand on the static evaluation, or try to improve on
+        it with moves that make a four, and on the first ply also moves
+        that make an open three. A five threat against `mover` must be
+        blocked instead. At most `depth` more plies are searched.
+        """
+        self.nodes += 1
+        if (self._deadline is not None or self._node_limit is not None
+                or self._cancel is not None):
+            self._check_budget()
+        stats = self._stats
+        if stats is not None:
+            stats.enter_node(depth - self.QUIESCENCE_DEPTH)
+
+        other = 3 - mover
+        if board.winning_cells(mover):
+            return self._WIN_SCORE
+        threats = board.winning_cells(other)
+        if board.has_multiple(threats):
+            return -self._WIN_SCORE  # Only one of them can be blocked
+
+        if stats is not None:
+            started = time.perf_counter()
+        best = self._evaluate_for(board, mover)
+        if stats is not None:
+            stats.add_time('evaluation', started)
+        if threats:
+            if depth == 0:
+                return best
+            moves = board.cells_of(threats)
+            best = float('-inf')  # Blocking is forced; standing pat isn't allowed
+        else:
+            if best >= beta or depth == 0:
+                if stats is not None:
+                    stats.leaf()
+                return best
+            alpha = max(alpha, best)
+            moves = board.cells_of(board.four_cells(mover))
+            if (self.QUIESCENCE_DEPTH - depth < self.QUIESCENCE_THREE_PLIES
+                    and not board.four_cells(other)):
+                # Filtered as cells: SparseBoard's set masks have no ``~``
+                fours = set(moves)
+                moves += [cell for cell in
+                          board.cells_of(board.pattern_cells(mover, THREE_PATTERNS))
+                          if cell not in fours]
+            if not moves:
+                if stats is not None:
+                    stats.leaf()
+                return best
+            moves = moves[:self.QUIESCENCE_BREADTH]
+
+        for x, y in moves:
+            board.make_move(x, y, mover)
+            try:
+                score = -self._quiesce(board, other, -beta, -alpha, depth - 1)
+            finally:
+                board.undo_move()
+            if score > best:
+                best = score
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+        return best
 
-        candidates = self._get_neighbor_moves(board, radius=1)
+    # ----------------------------------------------------------------
+    # Analysis: several scored moves instead of one
+    # ----------------------------------------------------------------
+    def analyse(self, board: Board, top_k: int = 3, time_budget: Optional[float] = None,
+                node_budget: Optional[int] = None, max_depth: Optional[int] = None
+                ) -> Tuple[int, List[Tuple[Tuple[int, int], float, List[Tuple[int, int]]]]]:
+        """The `top_k` best moves for this AI's player, whatever its difficulty.
+
+        Returns (depth, moves) where each move is (move, score, principal
+        variation) and scores are from this AI's side. `depth` counts the
+        plies of the last completed iteration, the candidate move included.
+        Budgets work as in get_move; without one, the search deepens to
+        `max_depth`, by default HARD_DEPTH.
+        """
+        self.tt.new_search()
+        self._new_ordering()
+        self._start_search(self.time_budget if time_budget is None else time_budget,
+                           self.node_budget if node_budget is None else node_budget)
+        self._stats = None
+
+        wins = board.winning_cells(self.player)
+        if wins:
+            return 1, [(move, float(self._WIN_SCORE), [move])
+                       for move in board.cells_of(wins)[:top_k]]
+        candidates = self._get_neighbor_moves(board, radius=2)
         if not candidates:
-            return self._evaluate_board(board)
+            center = board.center()
+            return 1, [(center, self._evaluate_board(board), [center])]
+        # Same candidates, in the same order, as _hard_move
+        heat = self._threat_scores(board, candidates, own_weight=1.1)
+        candidates.sort(key=lambda move: (heat[move], move), reverse=True)
+        candidates = candidates[:max(15, top_k)]
+
+        if max_depth is None:
+            budgeted = self._deadline is not None or self._node_limit is not None
+            max_depth = self.MAX_DEPTH if budgeted else self.HARD_DEPTH
+        scored: List[Tuple[Tuple[int, int], float]] = []
+        done = -1
+        for depth in range(max_depth + 1):
+            try:
+                scored = self._search_root_top(board, candidates, depth, top_k)
+            except SearchAborted:
+                if done >= 0:
+                    break
+                # Always finish one iteration, however small the budget
+                self._start_search(None, None)
+                scored = self._search_root_top(board, candidates, depth, top_k)
+            done = depth
+            candidates = [move for move, _ in scored]
+            if abs(scored[0][1]) >= self._WIN_SCORE:
+                break
 
-        # Limit breadth at deeper levels
-        if len(candidates) > 10:
-            scored = []
-            eval_player = self.player if is_maximizing else self.opponent
-            for x, y in candidates:
-                s = self._evaluate_position(board, x, y, self.player) + \
-                    self._evaluate_position(board, x, y, self.opponent)
-                scored.append((s, x, y))
-            scored.sort(reverse=True)
-            candidates = [(x, y) for _, x, y in scored[:10]]
-
-        if is_maximizing:
-            max_eval = float('-inf')
-            for x, y in candidates:
-                board.grid[x, y] = self.player
-                # Quick win check
-                from .move import Move
-                if board.check_win(Move(x, y, self.player)):
-                    board.grid[x, y] = board.EMPTY
-                    return 1000000
-                val = self._minimax(board, depth - 1, False, alpha, beta)
-                board.grid[x, y] = board.EMPTY
-                max_eval = max(max_eval, val)
-                alpha = max(alpha, val)
-                if beta <= alpha:
+        top = [(move, score, self._principal_variation(board, move, done + 1))
+               for move, score in scored[:top_k]]
+        return done + 1, top
+
+    def _search_root_top(self, board: Board, candidates, depth: int,
+                         top_k: int) -> List[Tuple[Tuple[int, int], float]]:
+        """Like _search_root, but score the best `top_k` candidates exactly.
+
+        Returns (move, score) best first, ties in candidate order. Moves
+        that can't reach the top `top_k` are searched against the current
+        k-th best score and only get an upper bound.
+        """
+        scored = []
+        for index, (x, y) in enumerate(candidates):
+            best = sorted(score for _, score, _ in scored)[-top_k:]
+            # Scores are whole numbers, so a tie with the k-th best is exact
+            alpha = best[0] - 1 if len(best) == top_k else float('-inf')
+            board.make_move(x, y, self.player)
+            try:
+                score = -self._negamax(board, depth, self.opponent,
+                                       float('-inf'), -alpha)
+            finally:
+                board.undo_move()
+            scored.append(((x, y), score, index))
+        scored.sort(key=lambda item: (-item[1], item[2]))
+        return [(move, score) for move, score, _ in scored]
+
+    def _principal_variation(self, board: Board, move: Tuple[int, int],
+                             length: int) -> List[Tuple[int, int]]:
+        """`move` followed by the best replies stored in the transposition table."""
+        line = [move]
+        board.make_move(*move, self.player)
+        maximizing = False
+        try:
+            while len(line) < length:
+                entry = self.tt.probe(board.hash << 1 | maximizing)
+                if entry is None or entry.best_move is None:
                     break
-            return max_eval
-        else:
-            min_eval = float('inf')
-            for x, y in candidates:
-                board.grid[x, y] = self.opponent
-                from .move import Move
-                if board.check_win(Move(x, y, self.opponent)):
-                    board.grid[x, y] = board.EMPTY
-                    return -1000000
-                val = self._minimax(board, depth - 1, True, alpha, beta)
-                board.grid[x, y] = board.EMPTY
-                min_eval = min(min_eval, val)
-                beta = min(beta, val)
-                if beta <= alpha:
+                x, y = entry.best_move
+                if not board.is_valid_move(x, y):
                     break
-            return min_eval
+                board.make_move(x, y, self.player if maximizing else self.opponent)
+                line.append((x, y))
+                maximizing = not maximizing
+        finally:
+            for _ in line:
+                board.undo_move()
+        return line
+
+    # ----------------------------------------------------------------
+    # Move ordering for _negamax: killer moves and history heuristic
+    # ----------------------------------------------------------------
+    def _new_ordering(self) -> None:
+        """Reset the killers and age the history scores for a new move."""
+        self._killers = [[None, None] for _ in range(self.MAX_DEPTH + 2)]
+        for scores in self._history.values():
+            for move in list(scores):
+                scores[move] >>= 1
+                if not scores[move]:
+                    del scores[move]
+
+    def _order_moves(self, board: Board, candidates: List[Tuple[int, int]], mover: int,
+                     ply: int, hint: Optional[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """The BREADTH most promising candidates for `mover`, best first.
+
+        Which candidates are kept depends only on the position and the
+        transposition-table move: that move, then a static threat tier
+        (making or blocking a four, then a three), then the threat
+        heatmap score of both players, then the cell. Killers
+        and history only reorder the kept ones, so the searched tree does
+        not depend on what was searched before it, nor on how the root
+        is split over workers. The kept moves go TT move first, then
+        this ply's killers, then by history score and tier.
+        """
+        killers = self._killers[ply] if ply < len(self._killers) else (None, None)
+        history = self._history[mover]
+        tiers = None
+        if len(candidates) > self.BREADTH:
+            other = 3 - mover
+            masks = (board.four_cells(mover),
+                     board.four_cells(other),
+                     board.pattern_cells(mover, THREE_PATTERNS),
+                     board.pattern_cells(other, THREE_PATTERNS))
+            heat = board.heatmaps(candidates)
+            tiers, scores = {}, {}
+            for x, y in candidates:
+                bit = board.cell_mask(x, y)
+                tiers[(x, y)] = sum(8 >> i for i, mask in enumerate(masks) if mask & bit)
+                scores[(x, y)] = heat[mover][x, y] + heat[other][x, y]
+            # Frontier order depends on the move history, so ties are
+            # broken by the cell itself
+            candidates.sort()
+            candidates.sort(key=lambda move: (move == hint, tiers[move], scores[move]),
+                            reverse=True)
+            del candidates[self.BREADTH:]
+
+        def key(move):
+            return (move == hint,
+                    2 if move == killers[0] else 1 if move == killers[1] else 0,
+                    history.get(move, 0),
+                    tiers[move] if tiers is not None else 0)
+
+        candidates.sort(key=key, reverse=True)
+        return candidates
+
+    def _record_cutoff(self, move: Tuple[int, int], mover: int, depth: int, ply: int) -> None:
+        if ply < len(self._killers):
+            killers = self._killers[ply]
+            if killers[0] != move:
+                killers[1] = killers[0]
+                killers[0] = move
+        history = self._history[mover]
+        history[move] = history.get(move, 0) + depth * depth
+
+    def _check_budget(self) -> None:
+        if self._cancel is not None and self._cancel.is_set():
+            raise SearchAborted
+        if self._node_limit is not None and self.nodes > self._node_limit:
+            raise SearchAborted
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            raise SearchAborted
 
     # ----------------------------------------------------------------
     # Evaluation helpers
     # ----------------------------------------------------------------
 
     # Pattern scores for evaluate_position
-    _PATTERN_SCORES = {
-        5: 100000,   # Five in a row (win)
-        4: {         # Four
-            'open': 10000,    # Live four (open both ends)
-            'half': 1000,     # Dead four (one end blocked)
-        },
-        3: {         # Three
-            'open': 1000,     # Live three
-            'half': 100,      # Dead three
-        },
-        2: {         # Two
-            'open': 100,      # Live two
-            'half': 10,       # Dead two
-        },
-        1: {
-            'open': 10,
-            'half': 1,
-        },
-    }
-
-    def _evaluate_position(self, board: Board, x: int, y: int, player: int) -> float:
-        """Evaluate how valuable placing `player` at (x, y) would be."""
-        score = 0.0
-        for dx, dy in board.directions:
-            count, open_ends = self._count_direction(board, x, y, dx, dy, player)
-            total = count + 1  # Include the hypothetical piece at (x, y)
-            if total >= 5:
-                score += self._PATTERN_SCORES[5]
-            elif open_ends > 0 and total >= 2:
-                kind = 'open' if open_ends == 2 else 'half'
-                clamped = min(total, 4)
-                score += self._PATTERN_SCORES[clamped][kind]
-        return score
-
-    def _count_direction(self, board: Board, x: int, y: int,
-                         dx: int, dy: int, player: int):
-        """Count consecutive pieces of `player` from (x,y) in both directions,
-        and how many ends are open."""
-        count = 0
-        open_ends = 0
-
-        # Forward
-        for i in range(1, 5):
-            nx, ny = x + dx * i, y + dy * i
-            if not (0 <= nx < board.size and 0 <= ny < board.size):
-                break
-            if board.grid[nx, ny] == player:
-                count += 1
-            elif board.grid[nx, ny] == board.EMPTY:
-                open_ends += 1
-                break
-            else:
-                break
-        else:
-            pass  # Reached limit without breaking
+    _PATTERN_SCORES = PATTERN_SCORES
+
+    def _threat_scores(self, board: Board, cells: List[Tuple[int, int]],
+                       own_weight: float = 1.0) -> Dict[Tuple[int, int], float]:
+        """How valuable each of `cells` is to play, attack and defence combined.
+
+        ``own_weight`` scales the AI's own pattern score against the
+        opponent's (the score of the cell as a block).
+        """
+        heat = board.heatmaps(cells)
+        own, other = heat[self.player], heat[self.opponent]
+        return {(x, y): own[x, y] * own_weight + other[x, y] for x, y in cells}
+
+    def likely_replies(self, board: Board, count: int = 3) -> List[Tuple[int, int]]:
+        """The opponent's `count` most likely next moves, best first.
+
+        Scored like MEDIUM would score them from the opponent's side.
+        """
+        cells = list(board.frontier(2))
+        heat = board.heatmaps(cells)
+        own, other = heat[self.opponent], heat[self.player]
+        scored = sorted(((own[x, y] * 1.1 + other[x, y], x, y) for x, y in cells),
+                        reverse=True)
+        return [(x, y) for _, x, y in scored[:count]]
 
-        # Backward
-        for i in range(1, 5):
-            nx, ny = x - dx * i, y - dy * i
-            if not (0 <= nx < board.size and 0 <= ny < board.size):
-                break
-            if board.grid[nx, ny] == player:
-                count += 1
-            elif board.grid[nx, ny] == board.EMPTY:
-                open_ends += 1
-                break
-            else:
-                break
+    def _evaluate_board(self, board: Board) -> float:
+        """Evaluate the entire board from AI's perspective.
 
-        return count, open_ends
+        Reads the running line totals kept by `board.evaluator`, which
+        equal the sum of every stone's pattern score in all four
+        directions.
+        """
+        totals = board.evaluator.totals
+        return float(totals[self.player] - totals[self.opponent])
 
-    def _evaluate_board(self, board: Board) -> float:
-        """Evaluate the entire board from AI's perspective."""
-        score = 0.0
-        size = board.size
-        for x in range(size):
-            for y in range(size):
-                if board.grid[x, y] == self.player:
-                    for dx, dy in board.directions:
-                        count, open_ends = self._count_direction(
-                            board, x, y, dx, dy, self.player)
-                        total = count + 1
-                        if total >= 5:
-                            score += self._PATTERN_SCORES[5]
-                        elif open_ends > 0 and total >= 2:
-                            kind = 'open' if open_ends == 2 else 'half'
-                            score += self._PATTERN_SCORES[min(total, 4)][kind]
-                elif board.grid[x, y] == self.opponent:
-                    for dx, dy in board.directions:
-                        count, open_ends = self._count_direction(
-                            board, x, y, dx, dy, self.opponent)
-                        total = count + 1
-                        if total >= 5:
-                            score -= self._PATTERN_SCORES[5]
-                        elif open_ends > 0 and total >= 2:
-                            kind = 'open' if open_ends == 2 else 'half'
-                            score -= self._PATTERN_SCORES[min(total, 4)][kind]
-        return score
+    def _evaluate_for(self, board: Board, player: int) -> float:
+        """_evaluate_board from `player`'s side."""
+        totals = board.evaluator.totals
+        return float(totals[player] - totals[3 - player])
 
     def _find_winning_move(self, board: Board, player: int) -> Optional[Tuple[int, int]]:
         """Find a move that wins immediately for `player`."""
-        from .move import Move
-        for x in range(board.size):
-            for y in range(board.size):
-                if board.grid[x, y] == board.EMPTY:
-                    board.grid[x, y] = player
-                    if board.check_win(Move(x, y, player)):
-                        board.grid[x, y] = board.EMPTY
-                        return (x, y)
-                    board.grid[x, y] = board.EMPTY
-        return None
+        wins = board.winning_cells(player)
+        return board.cells_of(wins)[0] if wins else None
 
     def _get_neighbor_moves(self, board: Board, radius: int = 2):
         """Return empty cells within `radius` of any existing piece."""
-        has_pieces = False
-        neighbors = set()
-        for x in range(board.size):
-            for y in range(board.size):
-                if board.grid[x, y] != board.EMPTY:
-                    has_pieces = True
-                    for dx in range(-radius, radius + 1):
-                        for dy in range(-radius, radius + 1):
-                            nx, ny = x + dx, y + dy
-                            if (0 <= nx < board.size and 0 <= ny < board.size
-                                    and board.grid[nx, ny] == board.EMPTY):
-                                neighbors.add((nx, ny))
-        if not has_pieces:
-            return []
-        return list(neighbors)
+        # Copied because callers place and remove pieces while iterating
+        return list(board.frontier(radius))
 
     def _random_move(self, board: Board) -> Tuple[int, int]:
-        empties = list(zip(*np.where(board.grid == board.EMPTY)))
-        return random.choice(empties)
+        return random.choice(board.empty_cells())
+
+
+def _search_root_chunk(board_class: type, snapshot: tuple, player: int,
+                       moves: List[Tuple[int, int]], depth: int, alpha: float,
+                       time_budget: Optional[float], node_budget: Optional[int]):
+    """Worker-process side of AI._search_root_parallel.
+
+    Builds a private board and a HARD AI with an empty transposition
+    table, so the result depends only on the arguments.
+    """
+    board = board_class.from_snapshot(snapshot)
+    ai = AI(Difficulty.HARD, player)
+    ai._start_search(time_budget, node_budget)
+    move, score = ai._search_root(board, moves, depth, alpha)
+    return move, score, ai.nodes
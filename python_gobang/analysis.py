@@ -0,0 +1,179 @@
+# src/python_gobang/analysis.py
+"""Batch position analysis.
+
+    python -m python_gobang.analysis positions.jsonl --out analysis.jsonl
+    python -m python_gobang.analysis games.rec --workers 4 --top 5 --time-budget 0.5
+
+Input is either JSON lines, one position per line,
+
+    {"id": "opening-3", "size": 15, "moves": [[7, 7], [7, 8], [8, 8]]}
+
+with black moving first and the stones alternating, or a binary game
+record file (see records.py), which is read as the position before
+every move of every game. Output is one JSON line per position, in
+input order:
+
+    {"id": "opening-3", "to_move": 2, "depth": 4, "nodes": 1570, "ms": 93.1,
+     "moves": [{"move": [8, 7], "score": 0.0, "pv": [[8, 7], [8, 9], ...]}, ...]}
+
+Scores are from the side to move. Positions from a record file also
+carry the move actually "played". A position that can't be replayed
+gets an "error" instead of "moves".
+
+Positions are read lazily and at most `--max-pending` are queued for
+the workers at once, so memory stays flat however long the input is.
+"""
+import argparse
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Deque, Iterable, Iterator, Optional, TextIO, Tuple
+
+from .ai import AI, Difficulty
+from .board import Board
+from .records import MAGIC, RecordReader
+
+
+def analyse_position(position: dict, top_k: int = 3, time_budget: Optional[float] = None,
+                     node_budget: Optional[int] = None,
+                     max_depth: Optional[int] = None) -> dict:
+    """Analysis of one position, as the JSON-ready dict written per line."""
+    result = {'id': position.get('id')}
+    if 'error' in position:
+        # Couldn't be read; see read_positions
+        result['error'] = position['error']
+        return result
+    if 'played' in position:
+        result['played'] = position['played']
+    player = 1
+    try:
+        size = position.get('size', 15)
+        if not isinstance(size, int) or isinstance(size, bool) or size < 1:
+            raise ValueError(f"size must be a positive integer, not {size!r}")
+        board = Board(size)
+        for x, y in position['moves']:
+            board.make_move(x, y, player)
+            player = 3 - player
+    except (KeyError, TypeError, ValueError) as e:
+        result['error'] = f"bad position: {e}"
+        return result
+
+    # A fresh AI per position keeps results independent of which worker
+    # analysed what before
+    ai = AI(Difficulty.HARD, player=player)
+    start = time.perf_counter()
+    depth, top = ai.analyse(board, top_k, time_budget, node_budget, max_depth)
+    result.update({
+        'to_move': player,
+        'depth': depth,
+        'nodes': ai.nodes,
+        'ms': round((time.perf_counter() - start) * 1000, 3),
+        'moves': [{'move': list(move), 'score': score, 'pv': [list(m) for m in pv]}
+                  for move, score, pv in top],
+    })
+    return result
+
+
+def analyse_positions(positions: Iterable[dict], workers: int = 1,
+                      max_pending: Optional[int] = None, **options) -> Iterator[dict]:
+    """Yield analyse_position(p, **options) for each position, in order.
+
+    With `workers` > 1 the positions are analysed in that many
+    processes, with at most `max_pending` (default 4 per worker) read
+    ahead of the one being yielded.
+    """
+    if workers <= 1:
+        for position in positions:
+            yield analyse_position(position, **options)
+        return
+
+    limit = max_pending or 4 * workers
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Deque = deque()
+        for position in positions:
+            pending.append(pool.submit(analyse_position, position, **options))
+            if len(pending) >= limit:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def read_positions(path: str) -> Iterator[dict]:
+    """Positions from a JSON-lines file or a binary game record file.
+
+    A line that isn't a JSON object is yielded as ``{"id": <line number>,
+    "error": ...}``, so it gets its own error line and the rest still run.
+    """
+    with open(path, 'rb') as f:
+        is_records = f.read(len(MAGIC)) == MAGIC
+    if is_records:
+        yield from _record_positions(path)
+        return
+    with open(path) as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                position = json.loads(line)
+            except ValueError as e:
+                yield {'id': number, 'error': f"bad position: {e}"}
+                continue
+            if not isinstance(position, dict):
+                yield {'id': number, 'error': "bad position: not a JSON object"}
+                continue
+            position.setdefault('id', number)
+            yield position
+
+
+def _record_positions(path: str) -> Iterator[dict]:
+    with RecordReader(path) as reader:
+        for game, record in enumerate(reader):
+            for ply, played in enumerate(record.moves):
+                yield {'id': f'{game}:{ply}', 'size': record.size,
+                       'moves': record.moves[:ply], 'played': list(played)}
+
+
+def write_analysis(results: Iterable[dict], out: TextIO) -> Tuple[int, int]:
+    """Write results as JSON lines; return (positions, errors)."""
+    count = errors = 0
+    for result in results:
+        out.write(json.dumps(result) + '\n')
+        count += 1
+        errors += 'error' in result
+    return count, errors
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m python_gobang.analysis',
+                                     description="Analyse positions in bulk.")
+    parser.add_argument('input', help="JSON-lines positions or a binary game record file")
+    parser.add_argument('--out', help="Output JSON-lines file (default: stdout)")
+    parser.add_argument('--top', type=int, default=3, help="Moves reported per position")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--max-pending', type=int,
+                        help="Positions queued ahead of the output (default: 4 per worker)")
+    parser.add_argument('--time-budget', type=float, help="Seconds per position")
+    parser.add_argument('--node-budget', type=int, help="Search nodes per position")
+    parser.add_argument('--depth', type=int,
+                        help="Deepest iteration (default: AI.HARD_DEPTH, "
+                             "or AI.MAX_DEPTH with a budget)")
+    args = parser.parse_args(argv)
+
+    results = analyse_positions(read_positions(args.input), workers=args.workers,
+                                max_pending=args.max_pending, top_k=args.top,
+                                time_budget=args.time_budget,
+                                node_budget=args.node_budget, max_depth=args.depth)
+    start = time.perf_counter()
+    if args.out:
+        with open(args.out, 'w') as out:
+            count, errors = write_analysis(results, out)
+    else:
+        count, errors = write_analysis(results, sys.stdout)
+    elapsed = time.perf_counter() - start
+    print(f"Analysed {count} positions in {elapsed:.1f}s ({errors} errors)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+# src/python_gobang/arena.py
+"""Headless AI-vs-AI tournaments.
+
+    python -m python_gobang.arena HARD MEDIUM --games 200 --out results.jsonl
+
+Plays games between two AI configurations across a process pool, with
+the first configuration ("A") taking black in even-numbered games and
+white in odd ones. One JSON line per finished game is appended to
+``--out``; a summary with A's score rate and its 95% confidence interval
+is printed at the end.
+"""
+import argparse
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from .ai import AI, Difficulty
+from .board import Board
+from .sparse_board import SparseBoard
+from .game_state import GameState, GameStatus
+from .move import Move
+from .records import DRAW, GameRecord, RecordWriter
+
+
+@dataclass
+class PlayerConfig:
+    difficulty: Difficulty
+    time_budget: Optional[float] = None  # Seconds per move (HARD and MCTS)
+    collect_stats: bool = False  # Log SearchStats next to each move
+
+    @classmethod
+    def parse(cls, text: str) -> 'PlayerConfig':
+        """Parse ``NAME`` or ``NAME:SECONDS``, e.g. ``hard:0.5``."""
+        name, _, budget = text.partition(':')
+        try:
+            difficulty = Difficulty[name.strip().upper()]
+        except KeyError:
+            raise ValueError(f"Unknown difficulty: {name!r}") from None
+        return cls(difficulty, float(budget) if budget else None)
+
+    def __str__(self):
+        if self.time_budget is None:
+            return self.difficulty.name
+        return f"{self.difficulty.name}:{self.time_budget:g}"
+
+    def create(self, player: int) -> AI:
+        return AI(self.difficulty, player=player, time_budget=self.time_budget,
+                  collect_stats=self.collect_stats)
+
+
+def play_game(black: PlayerConfig, white: PlayerConfig, size: int = 15,
+              seed: Optional[int] = None, sparse: bool = False) -> dict:
+    """Play one game to the end and return its record."""
+    random.seed(seed)
+    board = SparseBoard(size) if sparse else Board(size)
+    state = GameState()
+    players = {1: black.create(1), 2: white.create(2)}
+    moves = []
+    think_times = []
+    move_stats = []
+
+    while state.get_status() == GameStatus.PLAYING:
+        player = state.get_current_player()
+        start = time.perf_counter()
+        x, y = players[player].get_move(board)
+        think_times.append(round(time.perf_counter() - start, 6))
+        stats = players[player].stats
+        move_stats.append(stats.to_dict() if stats is not None else None)
+        if not board.is_valid_move(x, y):
+            # An illegal move forfeits the game
+            state.set_winner(3 - player)
+            break
+
+        board.make_move(x, y, player)
+        state.update_state(Move(x, y, player))
+        moves.append((x, y))
+        if board.check_win_at(x, y, player):
+            state.set_winner(player)
+        elif board.is_full():
+            state.set_draw()
+        else:
+            state.switch_player()
+
+    record = {
+        'black': str(black),
+        'white': str(white),
+        'winner': state.get_winner() or 0,
+        'length': len(moves),
+        'moves': moves,
+        'think_times': think_times,
+    }
+    if black.collect_stats or white.collect_stats:
+        record['stats'] = move_stats
+    return record
+
+
+def _play_pairing(index: int, config_a: PlayerConfig, config_b: PlayerConfig,
+                  size: int, seed: int, sparse: bool = False) -> dict:
+    a_is_black = index % 2 == 0
+    black, white = (config_a, config_b) if a_is_black else (config_b, config_a)
+    record = play_game(black, white, size, seed, sparse)
+    a_color = 1 if a_is_black else 2
+    record['game'] = index
+    record['seed'] = seed
+    record['a_color'] = a_color
+    record['result'] = ('draw' if record['winner'] == 0 else
+                        'a' if record['winner'] == a_color else 'b')
+    return record
+
+
+def wilson_interval(score: float, n: int, z: float = 1.96) -> Tuple[float, float]:
+    """Wilson score interval for a success rate of `score` out of `n` trials."""
+    if n == 0:
+        return 0.0, 1.0
+    p = score / n
+    denom = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+def run_arena(config_a: PlayerConfig, config_b: PlayerConfig, games: int,
+              out_path: str, size: int = 15, workers: Optional[int] = None,
+              seed: int = 0, records_path: Optional[str] = None,
+              sparse: bool = False) -> dict:
+    """Play `games` games, streaming records to `out_path`; return the summary.
+
+    With `records_path`, every game is also appended there as a binary
+    game record. With `sparse`, games are played on a SparseBoard.
+    """
+    tally = {'a': 0, 'b': 0, 'draw': 0}
+    start = time.perf_counter()
+    writer = RecordWriter(records_path) if records_path else None
+    try:
+        with open(out_path, 'a') as out, ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_play_pairing, i, config_a, config_b, size, seed + i,
+                                   sparse)
+                       for i in range(games)]
+            for future in as_completed(futures):
+                record = future.result()
+                tally[record['result']] += 1
+                out.write(json.dumps(record) + '\n')
+                out.flush()
+                if writer is not None:
+                    writer.write(GameRecord(size, record['moves'], record['black'],
+                                            record['white'], record['winner'] or DRAW))
+    finally:
+        if writer is not None:
+            writer.close()
+    elapsed = time.perf_counter() - start
+
+    score = tally['a'] + 0.5 * tally['draw']
+    low, high = wilson_interval(score, games)
+    return {
+        'a': str(config_a),
+        'b': str(config_b),
+        'games': games,
+        'a_wins': tally['a'],
+        'b_wins': tally['b'],
+        'draws': tally['draw'],
+        'a_score': score / games if games else 0.0,
+        'a_score_ci95': (low, high),
+        'seconds': elapsed,
+        'games_per_second': games / elapsed if elapsed else 0.0,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        prog='python -m python_gobang.arena',
+        description="Play AI-vs-AI games headlessly and report win rates.")
+    parser.add_argument('a', help="Config A: EASY, MEDIUM, HARD or MCTS, optionally NAME:SECONDS")
+    parser.add_argument('b', help="Config B, same format as A")
+    parser.add_argument('--games', type=int, default=100)
+    parser.add_argument('--size', type=int, default=15)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--seed', type=int, default=0,
+                        help="Game i is played with random seed SEED + i")
+    parser.add_argument('--out', default='arena.jsonl',
+                        help="JSON-lines file that game records are appended to")
+    parser.add_argument('--records', help="Also append games to this binary record file")
+    parser.add_argument('--stats', action='store_true',
+                        help="Record each move's search statistics in the game records")
+    parser.add_argument('--sparse', action='store_true',
+                        help="Play on the dict-backed board, for large sizes")
+    args = parser.parse_args(argv)
+
+    try:
+        config_a, config_b = PlayerConfig.parse(args.a), PlayerConfig.parse(args.b)
+    except ValueError as e:
+        parser.error(str(e))
+    config_a.collect_stats = config_b.collect_stats = args.stats
+
+    summary = run_arena(config_a, config_b, args.games, args.out,
+                        size=args.size, workers=args.workers, seed=args.seed,
+                        records_path=args.records, sparse=args.sparse)
+    low, high = summary['a_score_ci95']
+    print(f"{summary['a']} vs {summary['b']}: {summary['games']} games")
+    print(f"  A wins {summary['a_wins']}, B wins {summary['b_wins']}, draws {summary['draws']}")
+    print(f"  A score {summary['a_score']:.3f} (95% CI {low:.3f}-{high:.3f})")
+    print(f"  {summary['games_per_second']:.2f} games/s over {summary['seconds']:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,54 +1,327 @@
 # src/python_gobang/board.py
-import numpy as np
-from typing import Tuple, List
+import random
+from functools import lru_cache
+from itertools import permutations
+from typing import TYPE_CHECKING, Tuple, List, Optional, Set
 from .move import Move
+from .evaluator import PatternEvaluator
+from .threat_index import FIVE, FOUR, ThreatIndex
+
+# numpy is only needed for `grid` and `heatmaps`, so it is imported there
+if TYPE_CHECKING:
+    import numpy as np
+
+# Radii for which Board keeps an incremental candidate-move frontier
+FRONTIER_RADII = (1, 2)
+
+# Threat patterns along a line, read by Board.pattern_cells: 'x' is the
+# player's stone, '.' an empty cell and '*' an empty cell to report.
+# Cells that complete five
+FIVE_PATTERNS = tuple(sorted(set(''.join(p) for p in permutations('xxxx*'))))
+# Cells that make a four (three stones and two gaps in a five-cell window)
+FOUR_PATTERNS = tuple(sorted(set(''.join(p) for p in permutations('xxx**'))))
+# Cells that make an open four (.xxxx.)
+OPEN_FOUR_PATTERNS = tuple(sorted(set('.' + ''.join(p) + '.' for p in permutations('xxx*'))))
+# Cells that make an open three: two stones and two gaps between open ends
+THREE_PATTERNS = tuple(sorted(set('.' + ''.join(p) + '.' for p in permutations('xx**'))))
+# Every cell that stops an open three from becoming an open four
+THREE_DEFENCE_PATTERNS = tuple(sorted(set('*' + ''.join(p) + '*' for p in permutations('xxx*'))))
+
+
+@lru_cache(maxsize=None)
+def _frontier_windows(size: int, radius: int) -> List[List[int]]:
+    """For each bit index, the indices within `radius` of it (itself included)."""
+    stride = size + 1
+    windows = [[] for _ in range(size * stride)]
+    for x in range(size):
+        for y in range(size):
+            windows[x * stride + y] = [
+                nx * stride + ny
+                for nx in range(max(0, x - radius), min(size, x + radius + 1))
+                for ny in range(max(0, y - radius), min(size, y + radius + 1))]
+    return windows
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(size: int) -> List[List[int]]:
+    """Zobrist keys indexed [player][bit index] for a board of `size`.
+
+    Generated from a fixed seed so hashes are stable across runs and
+    processes; row 0 (the empty "player") is all zeros.
+    """
+    rng = random.Random(0x5EED)
+    cells = size * (size + 1)
+    return [[0] * cells] + [[rng.getrandbits(64) for _ in range(cells)] for _ in (1, 2)]
+
 
 class Board:
+    """Gobang board stored as one Python-int bitboard per player.
+
+    Cell (x, y) is bit ``x * stride + y`` with ``stride = size + 1``. The
+    extra column is never set, so shifting a bitboard along a row or a
+    diagonal cannot wrap a line of stones onto the next row.
+    """
+
     def __init__(self, size: int = 15):
         self.size = size
-        self.grid = np.zeros((size, size), dtype=int)
+        self.stride = size + 1
         self.EMPTY = 0
         self.directions = [(0, 1), (1, 0), (1, 1), (1, -1)]  # horizontal, vertical, diagonals
+        # Bit distance between neighbours for each entry of `directions`
+        self.shifts = [dx * self.stride + dy for dx, dy in self.directions]
+        self.cells_mask = 0
+        for x in range(size):
+            self.cells_mask |= ((1 << size) - 1) << (x * self.stride)
+        self.bits = [0, 0, 0]  # bits[player]; index 0 is unused
+        self.occupied = 0
+        self.stones = 0
+        # (x, y, player) of every make_move not yet undone
+        self._undo: List[Tuple[int, int, int]] = []
+        self._win_masks = {}
+        cells = size * self.stride
+        self._zobrist = zobrist_keys(size)
+        self.hash = 0
+        self._coords = [divmod(i, self.stride) for i in range(cells)]
+        self._windows = {r: _frontier_windows(size, r) for r in FRONTIER_RADII}
+        self._reset_frontier()
+        self.evaluator = PatternEvaluator(self)
+        self.threat_index = ThreatIndex(self)
 
     def initialize(self) -> None:
-        self.grid.fill(self.EMPTY)
+        self.bits = [0, 0, 0]
+        self.occupied = 0
+        self.stones = 0
+        self._undo = []
+        self.hash = 0
+        self._reset_frontier()
+        self.evaluator.reset()
+        self.threat_index.reset()
+
+    def snapshot(self) -> Tuple[int, int, int]:
+        """Compact picklable copy: (size, player 1 bits, player 2 bits)."""
+        return self.size, self.bits[1], self.bits[2]
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Tuple[int, int, int]) -> 'Board':
+        size, black, white = snapshot
+        board = cls(size)
+        for player, bits in ((1, black), (2, white)):
+            for x, y in board.cells_of(bits):
+                board.place_piece(x, y, player)
+        return board
+
+    def _reset_frontier(self) -> None:
+        cells = self.size * self.stride
+        # _near[r][i]: stones within radius r of bit i, counted so that
+        # remove_piece can undo place_piece exactly
+        self._near = {r: [0] * cells for r in FRONTIER_RADII}
+        self._frontier = {r: set() for r in FRONTIER_RADII}
+
+    def make_move(self, x: int, y: int, player: int) -> None:
+        """Play (x, y) for `player` so that undo_move can take it back."""
+        if not self.is_valid_move(x, y):
+            raise ValueError(f"Invalid move: ({x}, {y})")
+        self._place(x * self.stride + y, player)
+        self._undo.append((x, y, player))
+
+    def undo_move(self) -> Tuple[int, int, int]:
+        """Take back the last make_move; return its (x, y, player)."""
+        if not self._undo:
+            raise IndexError("No move to undo")
+        move = self._undo.pop()
+        self._remove(move[0] * self.stride + move[1], move[2])
+        return move
+
+    def last_move(self) -> Optional[Tuple[int, int, int]]:
+        return self._undo[-1] if self._undo else None
 
     def place_piece(self, x: int, y: int, player: int) -> None:
+        """Set up a stone outside the undo stack; invalid cells are ignored."""
         if self.is_valid_move(x, y):
-            self.grid[x, y] = player
+            self._place(x * self.stride + y, player)
+
+    def remove_piece(self, x: int, y: int) -> None:
+        """Clear (x, y) outside the undo stack."""
+        player = self.get_cell(x, y)
+        if player != self.EMPTY:
+            self._remove(x * self.stride + y, player)
+
+    def _place(self, idx: int, player: int) -> None:
+        self.bits[player] |= 1 << idx
+        self.occupied |= 1 << idx
+        self.stones += 1
+        self.hash ^= self._zobrist[player][idx]
+        coords = self._coords
+        for r in FRONTIER_RADII:
+            near, frontier = self._near[r], self._frontier[r]
+            for n in self._windows[r][idx]:
+                near[n] += 1
+                if near[n] == 1 and n != idx and not self.occupied >> n & 1:
+                    frontier.add(coords[n])
+            frontier.discard(coords[idx])
+        self.evaluator.update(idx)
+        self.threat_index.update(idx, player, True)
+
+    def _remove(self, idx: int, player: int) -> None:
+        self.bits[player] &= ~(1 << idx)
+        self.occupied &= ~(1 << idx)
+        self.stones -= 1
+        self.hash ^= self._zobrist[player][idx]
+        coords = self._coords
+        for r in FRONTIER_RADII:
+            near, frontier = self._near[r], self._frontier[r]
+            for n in self._windows[r][idx]:
+                near[n] -= 1
+                if near[n] == 0:
+                    frontier.discard(coords[n])
+            if near[idx]:
+                frontier.add(coords[idx])
+        self.evaluator.update(idx)
+        self.threat_index.update(idx, player, False)
 
     def is_valid_move(self, x: int, y: int) -> bool:
-        return (0 <= x < self.size and 
-                0 <= y < self.size and 
-                self.grid[x, y] == self.EMPTY)
+        return (0 <= x < self.size and
+                0 <= y < self.size and
+                not self.occupied >> (x * self.stride + y) & 1)
 
     def get_cell(self, x: int, y: int) -> int:
-        return self.grid[x, y]
+        bit = 1 << (x * self.stride + y)
+        if self.bits[1] & bit:
+            return 1
+        if self.bits[2] & bit:
+            return 2
+        return self.EMPTY
+
+    def center(self) -> Tuple[int, int]:
+        """Where the first stone goes."""
+        return self.size // 2, self.size // 2
+
+    def heatmaps(self, cells=None) -> 'np.ndarray':
+        """heat[player][x, y] for every cell; see heatmap.threat_heatmaps.
+
+        `cells` names the cells the caller will read; only those are
+        scored, in one vectorised pass, and the rest read 0.
+        """
+        from .heatmap import threat_heatmaps, threat_heatmaps_at
+        if cells is None:
+            return threat_heatmaps(self.grid)
+        return threat_heatmaps_at(self.grid, cells)
+
+    @property
+    def grid(self) -> 'np.ndarray':
+        """Read-only (size, size) array snapshot of the board."""
+        import numpy as np
+        grid = np.zeros((self.size, self.stride), dtype=int)
+        nbytes = (self.size * self.stride + 7) // 8
+        for player in (1, 2):
+            raw = np.frombuffer(self.bits[player].to_bytes(nbytes, 'little'), dtype=np.uint8)
+            cells = np.unpackbits(raw, bitorder='little')[:self.size * self.stride]
+            grid[cells.reshape(self.size, self.stride) == 1] = player
+        grid = grid[:, :self.size]
+        grid.flags.writeable = False
+        return grid
 
     def check_win(self, last_move: Move) -> bool:
-        x, y = last_move.x, last_move.y
-        player = last_move.player
-
-        for dx, dy in self.directions:
-            count = 1
-            # Check forward direction
-            for i in range(1, 5):
-                nx, ny = x + dx * i, y + dy * i
-                if not (0 <= nx < self.size and 0 <= ny < self.size) or self.grid[nx, ny] != player:
-                    break
-                count += 1
-
-            # Check backward direction
-            for i in range(1, 5):
-                nx, ny = x - dx * i, y - dy * i
-                if not (0 <= nx < self.size and 0 <= ny < self.size) or self.grid[nx, ny] != player:
-                    break
-                count += 1
-
-            if count >= 5:
+        return self.check_win_at(last_move.x, last_move.y, last_move.player)
+
+    def check_win_at(self, x: int, y: int, player: int) -> bool:
+        """Whether `player` has a five through (x, y)."""
+        player_bits = self.bits[player]
+        idx = x * self.stride + y
+        masks = self._win_masks.get(idx)
+        if masks is None:
+            masks = self._win_masks[idx] = self._build_win_masks(idx)
+
+        for shift, starts in zip(self.shifts, masks):
+            # Bit i of `run` is set when i, i+s, ..., i+4s all hold the player
+            run = player_bits & (player_bits >> shift)
+            run &= run >> (2 * shift)
+            run &= player_bits >> (4 * shift)
+            if run & starts:
                 return True
 
         return False
 
+    def _build_win_masks(self, idx: int) -> List[int]:
+        """Per direction, the start bits of every five that covers `idx`."""
+        masks = []
+        for shift in self.shifts:
+            starts = 0
+            for i in range(5):
+                if idx - i * shift >= 0:
+                    starts |= 1 << (idx - i * shift)
+            masks.append(starts & self.cells_mask)
+        return masks
+
     def is_full(self) -> bool:
-        return np.all(self.grid != self.EMPTY)
\ No newline at end of file
+        return self.stones == self.size * self.size
+
+    def frontier(self, radius: int) -> Set[Tuple[int, int]]:
+        """Empty cells within `radius` (Chebyshev distance) of any stone.
+
+        `radius` must be one of FRONTIER_RADII. The set is live board
+        state: copy it before placing or removing pieces while iterating.
+        """
+        return self._frontier[radius]
+
+    def pattern_cells(self, player: int, patterns) -> int:
+        """Mask of the '*' cells of every match of `patterns` for `player`.
+
+        Patterns are matched with shifts along all four directions, the
+        same way check_win finds fives.
+        """
+        own = self.bits[player]
+        empty = self.cells_mask & ~self.occupied
+        length = max(len(p) for p in patterns)
+        cells = 0
+        for shift in self.shifts:
+            # Bit i of own_at[j] / empty_at[j] describes the cell j steps on from i
+            own_at = [own >> (j * shift) for j in range(length)]
+            empty_at = [empty >> (j * shift) for j in range(length)]
+            for pattern in patterns:
+                starts = self.cells_mask
+                for j, ch in enumerate(pattern):
+                    starts &= own_at[j] if ch == 'x' else empty_at[j]
+                    if not starts:
+                        break
+                else:
+                    for j, ch in enumerate(pattern):
+                        if ch == '*':
+                            cells |= starts << (j * shift)
+        return cells & self.cells_mask
+
+    def winning_cells(self, player: int) -> int:
+        """Mask of the empty cells where `player` would complete five.
+
+        Read from the threat index, so it costs nothing; it matches
+        pattern_cells(player, FIVE_PATTERNS).
+        """
+        return self.threat_index.masks[FIVE][player]
+
+    def four_cells(self, player: int) -> int:
+        """Mask of the empty cells where `player` would make a four, as
+        pattern_cells(player, FOUR_PATTERNS) finds them, from the threat index."""
+        return self.threat_index.masks[FOUR][player]
+
+    def cell_mask(self, x: int, y: int) -> int:
+        """The mask holding only (x, y), to test against pattern_cells."""
+        return 1 << (x * self.stride + y)
+
+    def has_multiple(self, mask: int) -> bool:
+        """Whether a cell mask holds more than one cell."""
+        return mask & (mask - 1) != 0
+
+    def stones_of(self, player: int) -> List[Tuple[int, int]]:
+        return self.cells_of(self.bits[player])
+
+    def empty_cells(self) -> List[Tuple[int, int]]:
+        return self.cells_of(self.cells_mask & ~self.occupied)
+
+    def cells_of(self, mask: int) -> List[Tuple[int, int]]:
+        """Coordinates of the set bits of a cell mask, in bit order."""
+        cells = []
+        while mask:
+            low = mask & -mask
+            cells.append(divmod(low.bit_length() - 1, self.stride))
+            mask ^= low
+        return cells
@@ -1,19 +1,51 @@
 # src/python_gobang/console_ui.py
+import sys
 from colorama import init, Fore, Style
-from typing import Optional, Tuple
+from typing import Optional, TextIO, Tuple
 from .board import Board
 from .game_state import GameState, GameStatus
 from .move import Move
 from .ai import Difficulty
 
+# ANSI control sequences used by the differential renderer
+_CLEAR_SCREEN = '\x1b[2J\x1b[H'
+_CLEAR_LINE = '\x1b[2K'
+_CLEAR_BELOW = '\x1b[J'
+
+
+def _goto(row: int, col: int) -> str:
+    return f'\x1b[{row};{col}H'
+
+
 class ConsoleUI:
-    def __init__(self):
+    def __init__(self, differential: bool = False, out: Optional[TextIO] = None):
         init()  # Initialize colorama
         self.piece_symbols = {
             0: '.',
             1: '●',  # Black
             2: '○'   # White
         }
+        self._cell_text = {
+            0: self.piece_symbols[0],
+            1: f"{Fore.BLACK}{self.piece_symbols[1]}{Style.RESET_ALL}",
+            2: f"{Fore.WHITE}{self.piece_symbols[2]}{Style.RESET_ALL}",
+        }
+        # With `differential`, the board stays at the top of the screen
+        # and each frame only rewrites the cells that changed since the
+        # last one; messages and prompts go below the status lines.
+        self.differential = differential
+        self._out = out
+        self._shown: Optional[Tuple[int, int, int]] = None  # Board snapshot as last drawn
+        self._shown_size = 0
+
+    @property
+    def out(self) -> TextIO:
+        # Looked up per write: colorama's init() may replace sys.stdout
+        return self._out if self._out is not None else sys.stdout
+
+    def _write(self, text: str) -> None:
+        self.out.write(text)
+        self.out.flush()
 
     def select_game_mode(self) -> bool:
         """Let user choose PvP or PvAI. Returns True for PvAI."""
@@ -34,34 +66,78 @@ class ConsoleUI:
         print("1. 简单 Easy   - 随机走棋，仅防守必输局面")
         print("2. 中等 Medium - 贪心评估，攻守兼备")
         print("3. 困难 Hard   - 极小极大搜索 + Alpha-Beta 剪枝")
-        mapping = {'1': Difficulty.EASY, '2': Difficulty.MEDIUM, '3': Difficulty.HARD}
+        print("4. 蒙特卡洛 MCTS - 蒙特卡洛树搜索 + 批量随机模拟")
+        mapping = {'1': Difficulty.EASY, '2': Difficulty.MEDIUM, '3': Difficulty.HARD,
+                   '4': Difficulty.MCTS}
         while True:
-            choice = input("请选择难度 / Select difficulty (1/2/3): ").strip()
+            choice = input("请选择难度 / Select difficulty (1/2/3/4): ").strip()
             if choice in mapping:
-                labels = {'1': '简单 Easy', '2': '中等 Medium', '3': '困难 Hard'}
+                labels = {'1': '简单 Easy', '2': '中等 Medium', '3': '困难 Hard',
+                          '4': '蒙特卡洛 MCTS'}
                 print(f"\n已选择: {Fore.YELLOW}{labels[choice]}{Style.RESET_ALL}\n")
                 return mapping[choice]
-            print(f"{Fore.RED}无效输入，请输入 1、2 或 3{Style.RESET_ALL}")
+            print(f"{Fore.RED}无效输入，请输入 1、2、3 或 4{Style.RESET_ALL}")
 
     def display_board(self, board: Board) -> None:
-        print("\n  ", end="")
-        for i in range(board.size):
-            print(f"{i:2}", end="")
-        print("\n")
-        
+        if self.differential:
+            self._write(self.render_changes(board))
+        else:
+            self._write(self.render_board(board))
+
+    def render_board(self, board: Board) -> str:
+        """The whole board as one string, ready to write in one call."""
+        cell_text = self._cell_text
+        parts = ["\n  ", "".join(f"{i:2}" for i in range(board.size)), "\n\n"]
         for i in range(board.size):
-            print(f"{i:2}", end=" ")
-            for j in range(board.size):
-                piece = board.get_cell(i, j)
-                symbol = self.piece_symbols[piece]
-                if piece == 1:  # Black
-                    print(f"{Fore.BLACK}{symbol}{Style.RESET_ALL}", end=" ")
-                elif piece == 2:  # White
-                    print(f"{Fore.WHITE}{symbol}{Style.RESET_ALL}", end=" ")
-                else:
-                    print(symbol, end=" ")
-            print()
-        print()
+            parts.append(f"{i:2} ")
+            parts.append("".join(cell_text[board.get_cell(i, j)] + " "
+                                 for j in range(board.size)))
+            parts.append("\n")
+        parts.append("\n")
+        return "".join(parts)
+
+    def render_changes(self, board: Board) -> str:
+        """Escape sequences that bring the drawn board up to date with `board`.
+
+        The first frame, or one after the board size changes, clears
+        the screen and draws everything; later frames only move the
+        cursor to changed cells. Below the board come two status lines,
+        one message line, and then the prompt area, which every frame
+        clears and leaves the cursor at.
+        """
+        size = board.size
+        snapshot = board.snapshot()
+        cell_text = self._cell_text
+        if self._shown is None or self._shown[0] != size:
+            parts = [_CLEAR_SCREEN, "  ",
+                     "".join(f"{i:2}" for i in range(size)), "\n"]
+            for i in range(size):
+                parts.append(f"{i:2} ")
+                parts.append("".join(cell_text[board.get_cell(i, j)] + " "
+                                     for j in range(size)))
+                parts.append("\n")
+        else:
+            parts = []
+            _, black, white = self._shown
+            changed = (black ^ snapshot[1]) | (white ^ snapshot[2])
+            for i, j in board.cells_of(changed):
+                # Row 1 is the column header; each cell is 2 columns wide
+                parts.append(_goto(i + 2, 2 * j + 4))
+                parts.append(cell_text[board.get_cell(i, j)])
+        self._shown = snapshot
+        self._shown_size = size
+        parts.append(self._prompt_area())
+        return "".join(parts)
+
+    def _prompt_area(self) -> str:
+        return _goto(self._shown_size + 6, 1) + _CLEAR_BELOW
+
+    def _show_line(self, row: int, text: str) -> str:
+        return _goto(row, 1) + _CLEAR_LINE + text
+
+    def reset_display(self) -> None:
+        """Make the next differential frame a full redraw."""
+        self._shown = None
 
     def get_move(self) -> Optional[Tuple[int, int]]:
         try:
@@ -75,20 +151,33 @@ class ConsoleUI:
             return self.get_move()
 
     def show_message(self, msg: str) -> None:
-        print(f"\n{msg}\n")
+        if self.differential and self._shown is not None:
+            # One message line under the status lines, replaced each time
+            self._write(self._show_line(self._shown_size + 5, msg) + self._prompt_area())
+        else:
+            print(f"\n{msg}\n")
 
     def show_error(self, error: str) -> None:
-        print(f"\n{Fore.RED}Error: {error}{Style.RESET_ALL}\n")
+        self.show_message(f"{Fore.RED}Error: {error}{Style.RESET_ALL}")
 
     def display_game_status(self, state: GameState) -> None:
         scores = state.get_scores()
-        print(f"\nScores - Black: {scores[1]}, White: {scores[2]}")
-        
+        lines = [f"Scores - Black: {scores[1]}, White: {scores[2]}"]
+
         if state.get_status() == GameStatus.PLAYING:
             current = "Black" if state.get_current_player() == 1 else "White"
-            print(f"Current player: {current}")
+            lines.append(f"Current player: {current}")
         elif state.get_status() == GameStatus.WON:
             winner = "Black" if state.get_winner() == 1 else "White"
-            print(f"Game Over - {winner} wins!")
+            lines.append(f"Game Over - {winner} wins!")
+        else:
+            lines.append("Game Over - Draw!")
+
+        if self.differential and self._shown is not None:
+            # Status lines sit just below the board
+            row = self._shown_size + 3
+            self._write("".join(self._show_line(row + k, line)
+                                for k, line in enumerate(lines))
+                        + self._prompt_area())
         else:
-            print("Game Over - Draw!")
\ No newline at end of file
+            self._write("\n" + "\n".join(lines) + "\n")
\ No newline at end of file
@@ -0,0 +1,216 @@
+# src/python_gobang/engine.py
+"""Headless engine speaking the Gomocup (piskvork) protocol.
+
+    python -m python_gobang.engine
+    python main.py --engine
+
+Commands arrive one per line on stdin and answers go to stdout:
+
+    START 15            -> OK
+    INFO timeout_turn 5000
+    BEGIN               -> 7,7          (the engine moves first)
+    TURN 8,8            -> 6,6          (the opponent's move, then ours)
+    BOARD / x,y,1|2 ... / DONE -> x,y   (own stones are 1, the opponent's 2)
+    TAKEBACK 6,6        -> OK
+    RESTART             -> OK
+    ABOUT               -> name="...", version="...", ...
+    END                 -> exits
+
+The engine plays HARD with a time budget worked out from the INFO
+limits (timeout_turn, timeout_match, time_left, all in milliseconds).
+Malformed or invalid commands are answered with ERROR. If the search
+itself fails, the engine reports it with MESSAGE and still plays a
+legal move. Only the board and the AI are imported, and those only when a game
+starts, so a fresh process answers quickly.
+"""
+import sys
+import time
+import traceback
+from typing import Optional, TextIO, Tuple
+
+ABOUT = 'name="python-gobang", version="1.0", author="python_gobang", country="-"'
+
+# Boards larger than this use SparseBoard, which sets up in constant time
+DENSE_MAX_SIZE = 32
+# Share of the turn limit used for searching, plus a fixed allowance in
+# seconds for everything around the search
+TIME_SHARE = 0.8
+TIME_RESERVE = 0.05
+# Moves the remaining match time is spread over
+MOVES_TO_GO = 20
+
+
+class ProtocolError(Exception):
+    """Raised for a malformed or invalid command; the message goes to the manager."""
+
+
+class Engine:
+    def __init__(self, out: TextIO = sys.stdout):
+        self.out = out
+        self.board = None
+        self.ai = None
+        # Protocol limits in milliseconds; 0 means no limit for the match
+        self.timeout_turn = 30000
+        self.timeout_match = 0
+        self.time_left: Optional[int] = None
+        self._in_board = False
+
+    def send(self, line: str) -> None:
+        self.out.write(line + '\n')
+        self.out.flush()
+
+    def run(self, lines) -> None:
+        for line in lines:
+            if not self.handle(line):
+                break
+
+    def handle(self, line: str) -> bool:
+        """Carry out one command line; False once the engine should exit."""
+        line = line.strip()
+        if not line:
+            return True
+        command, _, arg = line.partition(' ')
+        command = command.upper()
+        try:
+            if self._in_board:
+                self._board_line(line)
+            elif command == 'END':
+                return False
+            elif command == 'START':
+                self._start(_int(arg))
+            elif command == 'RESTART':
+                self._require_game()
+                self.board.initialize()
+                self.send('OK')
+            elif command == 'INFO':
+                self._info(arg)
+            elif command == 'BEGIN':
+                self._require_game()
+                self._play()
+            elif command == 'TURN':
+                self._require_game()
+                self._place(*_coords(arg), 2)
+                self._play()
+            elif command == 'BOARD':
+                self._require_game()
+                self.board.initialize()
+                self._in_board = True
+            elif command == 'TAKEBACK':
+                self._require_game()
+                self._take_back(*_coords(arg))
+                self.send('OK')
+            elif command == 'ABOUT':
+                self.send(ABOUT)
+            elif command == 'RECTSTART':
+                self.send('ERROR rectangular boards are not supported')
+            else:
+                self.send(f'UNKNOWN {command}')
+        except ProtocolError as e:
+            self.send(f'ERROR {e}')
+        return True
+
+    def _require_game(self) -> None:
+        if self.board is None:
+            raise ProtocolError("no game started; send START first")
+
+    def _start(self, size: int) -> None:
+        if size < 5:
+            raise ProtocolError(f"unsupported size {size}")
+        from .ai import AI, Difficulty
+
+        if size <= DENSE_MAX_SIZE:
+            from .board import Board
+            self.board = Board(size)
+        else:
+            from .sparse_board import SparseBoard
+            self.board = SparseBoard(size)
+        self.ai = AI(Difficulty.HARD, player=1)
+        self.send('OK')
+
+    def _info(self, arg: str) -> None:
+        key, _, value = arg.partition(' ')
+        key = key.lower()
+        if key == 'timeout_turn':
+            self.timeout_turn = _int(value)
+        elif key == 'timeout_match':
+            self.timeout_match = _int(value)
+        elif key == 'time_left':
+            self.time_left = _int(value)
+        # max_memory, game_type, rule and the rest don't change our play
+
+    def _board_line(self, line: str) -> None:
+        if line.upper() == 'DONE':
+            self._in_board = False
+            self._play()
+            return
+        try:
+            x, y, field = line.split(',')
+        except ValueError:
+            raise ProtocolError(f"bad board line {line!r}") from None
+        x, y, field = _int(x), _int(y), _int(field)
+        # Field 3 only appears in continuous Renju games; treat it as theirs
+        self._place(x, y, 1 if field == 1 else 2)
+
+    def _place(self, x: int, y: int, player: int) -> None:
+        if not self.board.is_valid_move(x, y):
+            raise ProtocolError(f"invalid move {x},{y}")
+        self.board.place_piece(x, y, player)
+
+    def _take_back(self, x: int, y: int) -> None:
+        size = self.board.size
+        if not (0 <= x < size and 0 <= y < size) or not self.board.get_cell(x, y):
+            raise ProtocolError(f"no stone at {x},{y}")
+        self.board.remove_piece(x, y)
+
+    def move_budget(self) -> float:
+        """Seconds of search for the next move under the current limits."""
+        limit = self.timeout_turn / 1000 if self.timeout_turn > 0 else 0.1
+        if self.timeout_match > 0:
+            left = self.time_left if self.time_left is not None else self.timeout_match
+            limit = min(limit, left / 1000 / MOVES_TO_GO)
+        return max(0.01, limit * TIME_SHARE - TIME_RESERVE)
+
+    def _play(self) -> None:
+        start = time.perf_counter()
+        try:
+            x, y = self.ai.get_move(self.board, time_budget=self.move_budget())
+        except Exception as e:
+            # A search failure is our bug, not the manager's: still answer
+            # with a legal move so the game and both boards stay in step
+            traceback.print_exc(file=sys.stderr)
+            self.send(f'MESSAGE search failed ({e!r}); playing a fallback move')
+            x, y = self._fallback_move()
+        if not self.board.is_valid_move(x, y):
+            x, y = self._fallback_move()
+        self.board.place_piece(x, y, 1)
+        self.send(f'{x},{y}')
+        if self.time_left is not None:
+            # Until the manager sends a new time_left, count our own time
+            self.time_left -= int((time.perf_counter() - start) * 1000)
+
+    def _fallback_move(self) -> Tuple[int, int]:
+        """Some legal move, next to the stones if there are any."""
+        return next(iter(self.board.frontier(1)), self.board.center())
+
+
+def _int(value: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        raise ProtocolError(f"not a number: {value!r}") from None
+
+
+def _coords(arg: str) -> Tuple[int, int]:
+    try:
+        x, y = arg.split(',')
+    except ValueError:
+        raise ProtocolError(f"bad coordinates {arg!r}") from None
+    return _int(x), _int(y)
+
+
+def main() -> None:
+    Engine().run(sys.stdin)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+# src/python_gobang/evaluator.py
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+# Pattern scores for a run of stones, indexed by run length and then by
+# whether both ends ('open') or one end ('half') are empty
+PATTERN_SCORES = {
+    5: 100000,   # Five in a row (win)
+    4: {         # Four
+        'open': 10000,    # Live four (open both ends)
+        'half': 1000,     # Dead four (one end blocked)
+    },
+    3: {         # Three
+        'open': 1000,     # Live three
+        'half': 100,      # Dead three
+    },
+    2: {         # Two
+        'open': 100,      # Live two
+        'half': 10,       # Dead two
+    },
+    1: {
+        'open': 10,
+        'half': 1,
+    },
+}
+
+# Line scores seen so far per board size, keyed by the two players'
+# bitboards masked to the line (the same bits mean different lines on
+# boards of different sizes)
+_line_caches: Dict[int, Dict[Tuple[int, int], Tuple[int, int]]] = {}
+_LINE_CACHE_LIMIT = 1 << 18
+
+
+def score_line(cells: List[int]) -> Tuple[int, int]:
+    """Pattern score of one line for player 1 and player 2.
+
+    Every stone is credited with the run it belongs to, the same way
+    heatmap.threat_heatmaps scores a single cell: a run of five or more
+    scores a five per stone, a shorter run of two or more scores by its
+    length and number of empty ends, and a single stone scores nothing.
+    """
+    scores = [0, 0, 0]
+    n = len(cells)
+    i = 0
+    while i < n:
+        player = cells[i]
+        if not player:
+            i += 1
+            continue
+        j = i + 1
+        while j < n and cells[j] == player:
+            j += 1
+        length = j - i
+        if length >= 5:
+            scores[player] += length * PATTERN_SCORES[5]
+        elif length >= 2:
+            open_ends = (i > 0 and not cells[i - 1]) + (j < n and not cells[j])
+            if open_ends:
+                kind = 'open' if open_ends == 2 else 'half'
+                scores[player] += length * PATTERN_SCORES[length][kind]
+        i = j
+    return scores[1], scores[2]
+
+
+@lru_cache(maxsize=None)
+def _line_geometry(size: int):
+    """Bit indices and masks of every line, plus the lines through each bit."""
+    stride = size + 1
+    lines: List[List[int]] = []
+    masks: List[int] = []
+    lines_through: List[List[int]] = [[] for _ in range(size * stride)]
+    for dx, dy in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        for x in range(size):
+            for y in range(size):
+                # Start each line at its first cell in this direction
+                if 0 <= x - dx < size and 0 <= y - dy < size:
+                    continue
+                line = []
+                cx, cy = x, y
+                while 0 <= cx < size and 0 <= cy < size:
+                    line.append(cx * stride + cy)
+                    cx, cy = cx + dx, cy + dy
+                for idx in line:
+                    lines_through[idx].append(len(lines))
+                lines.append(line)
+                masks.append(sum(1 << idx for idx in line))
+    return lines, masks, lines_through
+
+
+class PatternEvaluator:
+    """Running pattern score of every row, column and diagonal of a board.
+
+    The board calls `update` after each placement or removal, which
+    re-scores only the four lines through the changed cell, so `totals`
+    always holds the full-board score of each player.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.lines, self.masks, self.lines_through = _line_geometry(board.size)
+        self._cache = _line_caches.setdefault(board.size, {})
+        self.reset()
+
+    def reset(self) -> None:
+        self.line_scores = [(0, 0)] * len(self.lines)
+        self.totals = [0, 0, 0]
+
+    def update(self, idx: int) -> None:
+        bits = self.board.bits
+        totals = self.totals
+        cache = self._cache
+        for line_id in self.lines_through[idx]:
+            mask = self.masks[line_id]
+            key = (bits[1] & mask, bits[2] & mask)
+            scores = cache.get(key)
+            if scores is None:
+                if len(cache) >= _LINE_CACHE_LIMIT:
+                    cache.clear()
+                black, white = key
+                cells = [(black >> i & 1) | (white >> i & 1) << 1
+                         for i in self.lines[line_id]]
+                scores = cache[key] = score_line(cells)
+            old = self.line_scores[line_id]
+            totals[1] += scores[0] - old[0]
+            totals[2] += scores[1] - old[1]
+            self.line_scores[line_id] = scores
+
+
+class SparsePatternEvaluator:
+    """PatternEvaluator for boards stored as a dict of stones.
+
+    Lines have no fixed extent on such a board, so instead of keeping a
+    score per line, `update` re-scores the stretch of each line that the
+    changed cell can affect: the runs touching it plus one cell past
+    each. The other runs on the line keep their scores, so the change in
+    that stretch is the change in the total.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self._cache: Dict[Tuple[int, ...], Tuple[int, int]] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        self.totals = [0, 0, 0]
+
+    def update(self, x: int, y: int, before: int, after: int) -> None:
+        """Account for (x, y) changing from `before` to `after`."""
+        cell_at = self.board.cell_at
+        cache = self._cache
+        totals = self.totals
+        for dx, dy in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            stretch = []
+            for sign in (-1, 1):
+                side = []
+                i = 1
+                run = cell_at(x + sign * dx, y + sign * dy)
+                cell = run
+                # The run next to (x, y), then the cell that ends it
+                while cell > 0 and cell == run:
+                    side.append(cell)
+                    i += 1
+                    cell = cell_at(x + sign * i * dx, y + sign * i * dy)
+                if cell >= 0:
+                    side.append(cell)
+                stretch.append(side)
+            left, right = stretch
+            left.reverse()
+            for value, sign in ((before, -1), (after, 1)):
+                key = (*left, value, *right)
+                scores = cache.get(key)
+                if scores is None:
+                    if len(cache) >= _LINE_CACHE_LIMIT:
+                        cache.clear()
+                    scores = cache[key] = score_line(list(key))
+                totals[1] += sign * scores[0]
+                totals[2] += sign * scores[1]
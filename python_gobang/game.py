@@ -3,15 +3,24 @@ from python_gobang.board import Board
 from python_gobang.console_ui import ConsoleUI
 from python_gobang.game_state import GameState, GameStatus
 from python_gobang.move import Move
-from python_gobang.ai import AI
+from python_gobang.ai import AI, Difficulty
+from python_gobang.ponder import Ponderer
+from python_gobang.records import GameRecord, RecordWriter
 
 
 class Game:
-    def __init__(self):
+    def __init__(self, ponder: bool = True, record_path: str = None,
+                 differential_ui: bool = False):
         self.board = Board()
-        self.ui = ConsoleUI()
+        # `differential_ui` redraws only the cells that changed each move
+        self.ui = ConsoleUI(differential=differential_ui)
         self.state = GameState()
         self.ai = None  # Set during start_game if PvAI
+        # HARD searches on the human's time when `ponder` is set
+        self.ponder = ponder
+        self.ponderer = None
+        # Finished and abandoned games are appended here when set
+        self.record_path = record_path
 
     def start_game(self) -> None:
         # Mode & difficulty selection
@@ -21,22 +30,31 @@ class Game:
             self.ai = AI(difficulty, player=2)  # AI plays white
         else:
             self.ai = None
+        self.ponderer = (Ponderer(self.ai)
+                         if self.ponder and self.ai and self.ai.difficulty == Difficulty.HARD
+                         else None)
 
         self.board.initialize()
         self.state.reset()
+        self.ui.reset_display()
         self._game_loop()
 
     def _game_loop(self) -> None:
         self.ui.display_board(self.board)
         self.ui.display_game_status(self.state)
 
+        pondered = None  # AI's answer to the human's last move, if pondered
         while self.state.get_status() == GameStatus.PLAYING:
             current_player = self.state.get_current_player()
 
             # AI's turn
             if self.ai and current_player == self.ai.player:
                 self.ui.show_message("AI 正在思考...")
-                x, y = self.ai.get_move(self.board)
+                if pondered is not None:
+                    x, y = pondered
+                else:
+                    x, y = self.ai.get_move(self.board)
+                pondered = None
                 self.ui.show_message(f"AI 落子: ({x}, {y})")
                 self.make_move(x, y)
                 self.ui.display_board(self.board)
@@ -44,8 +62,13 @@ class Game:
                 continue
 
             # Human's turn
+            if self.ponderer:
+                self.ponderer.start(self.board)
             move_coords = self.ui.get_move()
+            if self.ponderer:
+                pondered = self.ponderer.stop(move_coords)
             if move_coords is None:  # Player wants to quit
+                self.save_record()
                 self.quit_game()
                 return
 
@@ -53,18 +76,29 @@ class Game:
                 self.ui.display_board(self.board)
                 self.ui.display_game_status(self.state)
 
+        self.save_record()
+
+    def save_record(self) -> None:
+        if self.record_path is None or not self.state.get_move_history():
+            return
+        players = {1: 'HUMAN', 2: 'HUMAN'}
+        if self.ai:
+            players[self.ai.player] = self.ai.difficulty.name
+        record = GameRecord.from_state(self.state, self.board.size, players[1], players[2])
+        with RecordWriter(self.record_path) as writer:
+            writer.write(record)
+
     def make_move(self, x: int, y: int) -> bool:
         if not self.board.is_valid_move(x, y):
             self.ui.show_error("Invalid move position")
             return False
 
         current_player = self.state.get_current_player()
-        move = Move(x, y, current_player)
 
-        self.board.place_piece(x, y, current_player)
-        self.state.update_state(move)
+        self.board.make_move(x, y, current_player)
+        self.state.update_state(Move(x, y, current_player))
 
-        if self.board.check_win(move):
+        if self.board.check_win_at(x, y, current_player):
             self.state.set_winner(current_player)
         elif self.board.is_full():
             self.state.set_draw()
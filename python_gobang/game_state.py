@@ -39,6 +39,9 @@ class GameState:
     def get_winner(self) -> Optional[int]:
         return self._winner
 
+    def get_move_history(self) -> List[Move]:
+        return list(self._move_history)
+
     def get_scores(self) -> dict:
         return self._scores.copy()
 
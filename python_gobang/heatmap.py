@@ -0,0 +1,126 @@
+# src/python_gobang/heatmap.py
+import numpy as np
+from .evaluator import PATTERN_SCORES
+
+_PAD = 4  # A run is followed at most four cells out from the scored cell
+_DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+
+
+def _build_score_table() -> np.ndarray:
+    """Score of one direction indexed by [run length incl. the cell, open ends]."""
+    table = np.zeros((2 * _PAD + 2, 3))
+    for total in range(1, 2 * _PAD + 2):
+        for open_ends in range(3):
+            if total >= 5:
+                table[total, open_ends] = PATTERN_SCORES[5]
+            elif open_ends > 0 and total >= 2:
+                kind = 'open' if open_ends == 2 else 'half'
+                table[total, open_ends] = PATTERN_SCORES[min(total, 4)][kind]
+    return table
+
+
+_SCORE_TABLE = _build_score_table()
+
+
+def threat_heatmaps(grid: np.ndarray) -> np.ndarray:
+    """Score every empty cell of `grid` for both players in one pass.
+
+    Returns a (3, size, size) array where ``heat[player][x, y]`` is what
+    placing `player` at (x, y) is worth: for each direction, the run of
+    the player's stones through the cell (up to four either side) scored
+    by length and open ends. Occupied cells score 0 and ``heat[0]`` is
+    unused, matching the ``Board.bits`` indexing.
+    """
+    size = grid.shape[0]
+    padded = np.full((size + 2 * _PAD, size + 2 * _PAD), -1, dtype=np.int8)
+    padded[_PAD:_PAD + size, _PAD:_PAD + size] = grid
+    # own[p - 1]: player p's stones; the -1 border is neither own nor empty
+    own = padded[np.newaxis] == np.array([1, 2], dtype=np.int8)[:, np.newaxis, np.newaxis]
+    empty = padded == 0
+
+    heat = np.zeros((3, size, size))
+    for dx, dy in _DIRECTIONS:
+        counts = np.zeros((2, size, size), dtype=np.int8)
+        open_ends = np.zeros((2, size, size), dtype=np.int8)
+        for sign in (1, -1):
+            alive = np.ones((2, size, size), dtype=bool)
+            for i in range(1, _PAD + 1):
+                ox, oy = _PAD + sign * dx * i, _PAD + sign * dy * i
+                # The run stops at the first cell that isn't the player's;
+                # if that cell is empty the end is open
+                open_ends += alive & empty[ox:ox + size, oy:oy + size]
+                alive &= own[:, ox:ox + size, oy:oy + size]
+                counts += alive
+        heat[1:] += _SCORE_TABLE[counts + 1, open_ends]
+
+    heat[:, grid != 0] = 0
+    return heat
+
+
+# Offsets of the cells up to four steps out from a cell, indexed by
+# [direction, side, step]
+_STEPS = np.arange(1, _PAD + 1)
+_SIDES = np.array([1, -1])[:, np.newaxis] * _STEPS
+_OFFSETS_X = np.array([dx for dx, _ in _DIRECTIONS])[:, np.newaxis, np.newaxis] * _SIDES
+_OFFSETS_Y = np.array([dy for _, dy in _DIRECTIONS])[:, np.newaxis, np.newaxis] * _SIDES
+_PLAYERS = np.array([1, 2], dtype=np.int8).reshape(2, 1, 1, 1, 1)
+
+
+def threat_heatmaps_at(grid: np.ndarray, cells) -> np.ndarray:
+    """threat_heatmaps with only the listed `cells` scored.
+
+    The cells around each listed cell are gathered in one indexing pass,
+    so a search scoring its few candidates doesn't pay for the whole
+    board. Cells not listed read 0.
+    """
+    size = grid.shape[0]
+    heat = np.zeros((3, size, size))
+    cells = list(cells)
+    if not cells:
+        return heat
+    padded = np.full((size + 2 * _PAD, size + 2 * _PAD), -1, dtype=np.int8)
+    padded[_PAD:_PAD + size, _PAD:_PAD + size] = grid
+    xs, ys = np.array(cells).T
+    # near[i, d, s, k]: the cell k + 1 steps out from cell i along side s
+    # of direction d
+    near = padded[xs[:, np.newaxis, np.newaxis, np.newaxis] + _PAD + _OFFSETS_X,
+                  ys[:, np.newaxis, np.newaxis, np.newaxis] + _PAD + _OFFSETS_Y]
+    # The same run and open-end rules as threat_heatmaps, for both players
+    alive = np.logical_and.accumulate(near == _PLAYERS, axis=-1)
+    reached = np.concatenate([np.ones(alive.shape[:-1] + (1,), dtype=bool),
+                              alive[..., :-1]], axis=-1)
+    counts = alive.sum(axis=(-2, -1))
+    open_ends = (reached & (near == 0)).sum(axis=(-2, -1))
+    heat[1:, xs, ys] = _SCORE_TABLE[counts + 1, open_ends].sum(axis=-1) * (grid[xs, ys] == 0)
+    return heat
+
+
+_SCORE_ROWS = _SCORE_TABLE.tolist()
+
+
+def threat_scores_at(cell_at, cells) -> dict:
+    """threat_heatmaps for the listed empty `cells` only, without a grid.
+
+    `cell_at(x, y)` gives the player at a cell, 0 if empty or -1 off the
+    board. Returns ``{player: {(x, y): score}}`` for players 1 and 2,
+    with the same scores as threat_heatmaps.
+    """
+    heat = {1: {}, 2: {}}
+    for x, y in cells:
+        totals = [0.0, 0.0, 0.0]
+        for dx, dy in _DIRECTIONS:
+            # The cells up to four steps out on each side of (x, y)
+            sides = [[cell_at(x + sign * dx * i, y + sign * dy * i)
+                      for i in range(1, _PAD + 1)] for sign in (1, -1)]
+            for player in (1, 2):
+                count = open_ends = 0
+                for side in sides:
+                    for cell in side:
+                        if cell != player:
+                            open_ends += cell == 0
+                            break
+                        count += 1
+                totals[player] += _SCORE_ROWS[count + 1][open_ends]
+        heat[1][x, y] = totals[1]
+        heat[2][x, y] = totals[2]
+    return heat
@@ -0,0 +1,166 @@
+# src/python_gobang/loadgen.py
+"""Load generator for the game server.
+
+    python -m python_gobang.server --port 7777 &
+    python -m python_gobang.loadgen --port 7777 --clients 200 --games 5
+
+Each simulated client opens its own connection and plays whole games,
+choosing random moves next to the stones already on the board. Games
+run side by side across clients, so `--clients` is the number of
+concurrent sessions. Round-trip latency of every move request is
+collected and printed with the server's own metrics.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import List, Optional
+
+from .board import Board
+
+# Back-off before retrying a request answered 'busy', doubled per retry
+BUSY_DELAY = 0.05
+MAX_BUSY_DELAY = 1.0
+
+
+class Client:
+    """One connection to the server, one request at a time."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self._next_id = 0
+
+    @classmethod
+    async def connect(cls, host: str = '127.0.0.1', port: int = 7777,
+                      unix_path: Optional[str] = None) -> 'Client':
+        if unix_path is not None:
+            reader, writer = await asyncio.open_unix_connection(unix_path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def request(self, **request) -> dict:
+        self._next_id += 1
+        request['id'] = self._next_id
+        self.writer.write(json.dumps(request).encode() + b'\n')
+        await self.writer.drain()
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        return json.loads(line)
+
+    async def close(self) -> None:
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except OSError:
+            pass  # Already reset by the server
+
+
+class LoadStats:
+    def __init__(self):
+        self.latencies_ms: List[float] = []
+        self.games = 0
+        self.moves = 0
+        self.busy = 0
+        self.errors = 0
+
+
+async def _play_games(client: Client, games: int, difficulty: str, size: int,
+                      time_budget: Optional[float], rng: random.Random,
+                      stats: LoadStats) -> None:
+    for _ in range(games):
+        response = await client.request(op='new', difficulty=difficulty, size=size,
+                                        time_budget=time_budget)
+        if not response['ok']:
+            stats.errors += 1
+            continue
+        game = response['game']
+        board = Board(size)
+        human, ai = 1, 2
+        while response.get('status', 'playing') == 'playing':
+            candidates = sorted(board.frontier(1)) or [(size // 2, size // 2)]
+            x, y = rng.choice(candidates)
+            delay = BUSY_DELAY
+            while True:
+                start = time.perf_counter()
+                response = await client.request(op='move', game=game, x=x, y=y)
+                if response.get('error') != 'busy':
+                    break
+                stats.busy += 1
+                await asyncio.sleep(delay * (0.5 + rng.random()))
+                delay = min(MAX_BUSY_DELAY, delay * 2)
+            if not response['ok']:
+                stats.errors += 1
+                break
+            stats.latencies_ms.append((time.perf_counter() - start) * 1000)
+            stats.moves += 1
+            board.place_piece(x, y, human)
+            if response['ai_move'] is not None:
+                board.place_piece(*response['ai_move'], ai)
+        await client.request(op='close', game=game)
+        stats.games += 1
+
+
+async def run_load(host: str, port: int, unix_path: Optional[str], clients: int,
+                   games: int, difficulty: str, size: int,
+                   time_budget: Optional[float], seed: int) -> dict:
+    stats = LoadStats()
+    connections = [await Client.connect(host, port, unix_path) for _ in range(clients)]
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(
+            _play_games(client, games, difficulty, size, time_budget,
+                        random.Random(seed + i), stats)
+            for i, client in enumerate(connections)))
+        elapsed = time.perf_counter() - start
+        server_metrics = await connections[0].request(op='metrics')
+    finally:
+        for client in connections:
+            await client.close()
+
+    ordered = sorted(stats.latencies_ms) or [0.0]
+    n = len(ordered)
+    return {
+        'clients': clients,
+        'games': stats.games,
+        'moves': stats.moves,
+        'busy': stats.busy,
+        'errors': stats.errors,
+        'seconds': elapsed,
+        'moves_per_second': stats.moves / elapsed if elapsed else 0.0,
+        'latency_ms': {f'p{q}': ordered[min(n - 1, n * q // 100)] for q in (50, 95, 99)},
+        'server': server_metrics,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m python_gobang.loadgen',
+                                     description="Drive the game server with simulated players.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7777)
+    parser.add_argument('--unix', help="Connect to this Unix socket path instead of TCP")
+    parser.add_argument('--clients', type=int, default=50, help="Concurrent connections")
+    parser.add_argument('--games', type=int, default=2, help="Games per client")
+    parser.add_argument('--difficulty', default='MEDIUM')
+    parser.add_argument('--size', type=int, default=15)
+    parser.add_argument('--time-budget', type=float)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    summary = asyncio.run(run_load(args.host, args.port, args.unix, args.clients,
+                                   args.games, args.difficulty, args.size,
+                                   args.time_budget, args.seed))
+    latency = summary['latency_ms']
+    print(f"{summary['games']} games, {summary['moves']} moves by {summary['clients']} clients"
+          f" in {summary['seconds']:.1f}s ({summary['moves_per_second']:.1f} moves/s)")
+    print(f"  move round trip p50 {latency['p50']:.1f}ms  p95 {latency['p95']:.1f}ms"
+          f"  p99 {latency['p99']:.1f}ms")
+    print(f"  busy answers {summary['busy']}, errors {summary['errors']}")
+    print(json.dumps(summary['server'], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+# src/python_gobang/mcts.py
+import math
+import random
+import threading
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .board import Board
+
+# Playouts per search when neither a time nor a playout budget is given
+DEFAULT_PLAYOUTS = 4096
+# Leaves gathered per batch, and random games played from each; every
+# batch is one call of `rollouts` on LEAVES * PLAYOUTS_PER_LEAF boards
+LEAVES = 16
+PLAYOUTS_PER_LEAF = 8
+# Rollouts longer than this many plies are scored as draws
+MAX_ROLLOUT_PLIES = 60
+# Progressive widening: a node visited n times (in leaves) may have
+# ceil(WIDEN_C * n ** WIDEN_ALPHA) children, best threat score first
+WIDEN_C = 1.0
+WIDEN_ALPHA = 0.5
+EXPLORATION = 0.7
+# Weight of a child's threat score against its rollout results; it fades
+# as the child is visited
+PRIOR_WEIGHT = 1.0
+# An unbounded board has no edge, so rollouts there play on the box
+# around the stones widened by this many cells, whose border acts as
+# the edge (a lone stone gets the room of a 15x15 board)
+ROLLOUT_MARGIN = 7
+
+_PAD = 4  # Border around rollout boards, wide enough for a five check
+_DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+_NEIGHBOURS = tuple((dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx or dy)
+# Nine cells of a line, centre at bit 4, as a number; _FIVES[n] says
+# whether the set bits hold five in a row through the centre
+_BITS = 1 << np.arange(9)
+_FIVES = np.array([any(n >> start & 31 == 31 for start in range(5)) for n in range(512)])
+
+
+class Node:
+    __slots__ = ('move', 'player', 'parent', 'children', 'untried', 'visits', 'wins',
+                 'prior', 'winner', 'hash')
+
+    def __init__(self, move: Optional[Tuple[int, int]], player: int,
+                 parent: Optional['Node'], board_hash: int, prior: float = 0.0):
+        self.move = move
+        self.player = player  # Who played `move`, i.e. not the player to move here
+        self.parent = parent
+        self.children: List[Node] = []
+        # Moves not yet expanded, as (move, prior), best first
+        self.untried: Optional[List[Tuple[Tuple[int, int], float]]] = None
+        self.visits = 0  # In playouts
+        self.wins = 0.0  # For `player`; a draw counts half
+        self.prior = prior  # Threat score of `move`, scaled to 0-1 among its siblings
+        self.winner: Optional[int] = None  # Set when `move` ended the game
+        self.hash = board_hash
+
+
+def rollout_window(board: Board, stones) -> Tuple[Tuple[int, int], int]:
+    """Origin and size of the square rollouts play on: the whole board,
+    or on an unbounded board the box around all of `stones` (per start,
+    each player's stones) widened by ROLLOUT_MARGIN."""
+    if board.size is not None:
+        return (0, 0), board.size
+    cells = [cell for start in stones for own in start for cell in own] or [board.center()]
+    xs = [x for x, _ in cells]
+    ys = [y for _, y in cells]
+    size = max(max(xs) - min(xs), max(ys) - min(ys)) + 1 + 2 * ROLLOUT_MARGIN
+    return (min(xs) - ROLLOUT_MARGIN, min(ys) - ROLLOUT_MARGIN), size
+
+
+def padded(stones, origin: Tuple[int, int], size: int) -> np.ndarray:
+    """Each player's `stones` on the `size` square at `origin`, as a flat
+    int8 array with a border of -1 cells, as rollouts takes it."""
+    span = size + 2 * _PAD
+    left, top = origin
+    cells = np.full((span, span), -1, dtype=np.int8)
+    cells[_PAD:_PAD + size, _PAD:_PAD + size] = 0
+    for player, own in zip((1, 2), stones):
+        for x, y in own:
+            cells[_PAD + x - left, _PAD + y - top] = player
+    return cells.reshape(-1)
+
+
+def rollouts(starts: np.ndarray, to_move: np.ndarray, repeats: int, size: int,
+             rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """Play `repeats` random games from each of `starts` (padded boards)
+    at once; return per start (wins for its `to_move`, draws).
+
+    All the games are rows of one array, advanced a ply per step: each
+    game plays a random empty cell next to a stone, and the nine cells
+    through the stone just placed are gathered along each direction and
+    looked up as bit patterns to check for a five. The random choice is
+    the largest of 8-bit keys, so ties go to the lower cell, a bias
+    rollouts can afford for the speed. Games still going after
+    MAX_ROLLOUT_PLIES are draws.
+    """
+    span = size + 2 * _PAD
+    count = len(starts) * repeats
+    boards = np.repeat(starts, repeats, axis=0)
+    first_player = np.repeat(to_move.astype(np.int8), repeats)
+    players = first_player.copy()
+
+    # Empty cells next to a stone; the border keeps np.roll from wrapping stones
+    grid = boards.reshape(count, span, span) > 0
+    near = np.zeros_like(grid)
+    for dx, dy in _NEIGHBOURS:
+        near |= np.roll(grid, (dx, dy), axis=(1, 2))
+    open_cells = near.reshape(count, -1) & (boards == 0)
+    centre = (_PAD + size // 2) * span + _PAD + size // 2
+    first = ~open_cells.any(axis=1) & (boards[:, centre] == 0)
+    open_cells[first, centre] = True  # An empty board opens at the centre
+
+    cells = span * span
+    neighbours = np.array([dx * span + dy for dx, dy in _NEIGHBOURS])
+    lines = np.array([[k * (dx * span + dy) for k in range(-4, 5)]
+                      for dx, dy in _DIRECTIONS])
+    flat_boards, flat_open = boards.reshape(-1), open_cells.reshape(-1)
+    winner = np.zeros(count, dtype=np.int8)
+    everyone = np.arange(count)
+    # Each ply's keys are a window of one pool of random bytes at a random
+    # offset, which costs far less than drawing fresh bytes every ply
+    area = count * cells
+    pool = np.frombuffer(rng.bytes(4 * area), dtype=np.uint8) | 1
+    offsets = rng.integers(0, 3 * area, MAX_ROLLOUT_PLIES)
+    for ply in range(MAX_ROLLOUT_PLIES):
+        keys = pool[offsets[ply]:offsets[ply] + area].reshape(count, cells)
+        choice = (keys * open_cells).argmax(axis=1)
+        # Rows with no open cell left (won, or a full board) pick cell 0, which is closed
+        rows = np.flatnonzero(open_cells[everyone, choice])
+        if not len(rows):
+            break
+        placed = rows * cells + choice[rows]
+        player = players[rows]
+        flat_boards[placed] = player
+        flat_open[placed] = False
+        around = placed[:, None] + neighbours
+        flat_open[around] = flat_boards[around] == 0
+
+        # The player's stones on the nine cells through the new one, per
+        # direction, read as a 9-bit number and looked up in _FIVES
+        line = flat_boards[placed[:, None, None] + lines] == player[:, None, None]
+        won = _FIVES[line.dot(_BITS)].any(axis=1)
+        done = rows[won]
+        winner[done] = player[won]
+        open_cells[done] = False
+        players ^= 3
+
+    wins = (winner == first_player).reshape(-1, repeats).sum(axis=1)
+    draws = (winner == 0).reshape(-1, repeats).sum(axis=1)
+    return wins, draws
+
+
+class MCTS:
+    """UCT search whose leaves are valued by batches of vectorised rollouts.
+
+    Each batch walks down the tree LEAVES times by UCB1, adding a child
+    each time; every walk counts as PLAYOUTS_PER_LEAF lost playouts on
+    its path until the batch is scored (a virtual loss), which spreads
+    the walks over different leaves. All the leaves' rollouts are then
+    played together by `rollouts`. Children come from the cells next to
+    stones (or the cells that win or block a five), best threat score
+    first; progressive widening lets a node grow only as its visit count
+    does, and the threat score biases selection until rollouts outweigh
+    it. The tree is kept after a move and reused when a later search
+    starts from one of its positions.
+    """
+
+    def __init__(self, player: int, leaves: int = LEAVES,
+                 playouts_per_leaf: int = PLAYOUTS_PER_LEAF,
+                 exploration: float = EXPLORATION):
+        self.player = player
+        self.leaves = leaves
+        self.playouts_per_leaf = playouts_per_leaf
+        self.exploration = exploration
+        self.root: Optional[Node] = None
+        # Figures for the last search
+        self.playouts = 0
+        self.seconds = 0.0
+        self.reused_visits = 0
+
+    @property
+    def playouts_per_second(self) -> float:
+        return self.playouts / self.seconds if self.seconds else 0.0
+
+    def search(self, board: Board, time_budget: Optional[float] = None,
+               playouts: Optional[int] = None,
+               cancel: Optional[threading.Event] = None) -> Tuple[int, int]:
+        """Most visited move for this player after the budgeted playouts."""
+        start = time.perf_counter()
+        if time_budget is None and playouts is None:
+            playouts = DEFAULT_PLAYOUTS
+        deadline = None if time_budget is None else start + time_budget
+        rng = np.random.default_rng(random.getrandbits(64))
+
+        root = self._find_root(board)
+        self.root = root
+        self.reused_visits = root.visits
+        self.playouts = 0
+        if root.untried is None and not root.children:
+            root.untried = self._candidates(board, root)
+        if len(root.children) + len(root.untried) == 1:
+            # Forced (or the only) move: nothing to search
+            self.seconds = time.perf_counter() - start
+            return root.children[0].move if root.children else root.untried[0][0]
+
+        while True:
+            self._batch(board, root, rng)
+            if playouts is not None and self.playouts >= playouts:
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            if cancel is not None and cancel.is_set():
+                break
+
+        self.seconds = time.perf_counter() - start
+        best = max(root.children, key=lambda child: child.visits)
+        return best.move
+
+    def _find_root(self, board: Board) -> Node:
+        """The stored node for `board` within two plies of the last root, or a new one."""
+        opponent = 3 - self.player
+        if self.root is not None:
+            level = [self.root]
+            for _ in range(3):
+                for node in level:
+                    if node.hash == board.hash and node.player == opponent:
+                        node.parent = None
+                        return node
+                level = [child for node in level for child in node.children]
+        return Node(None, opponent, None, board.hash)
+
+    def _candidates(self, board: Board, node: Node) -> List[Tuple[Tuple[int, int], float]]:
+        """(move, prior) to expand at `node`, most promising first."""
+        mover = 3 - node.player
+        wins = board.winning_cells(mover)
+        if wins:
+            return [(board.cells_of(wins)[0], 1.0)]
+        blocks = board.winning_cells(node.player)
+        if blocks:
+            return [(cell, 1.0) for cell in board.cells_of(blocks)]
+        cells = list(board.frontier(1))
+        if not cells:
+            return [(board.center(), 1.0)]
+        heat = board.heatmaps(cells)
+        own, other = heat[mover], heat[node.player]
+        scored = sorted(((own[cell] * 1.1 + other[cell], cell) for cell in cells),
+                        reverse=True)
+        top = scored[0][0] or 1.0
+        return [(cell, score / top) for score, cell in scored]
+
+    def _batch(self, board: Board, root: Node, rng: np.random.Generator) -> None:
+        """Gather up to `leaves` leaves, play their rollouts, back up the results."""
+        per_leaf = self.playouts_per_leaf
+        pending: List[Node] = []
+        stones = []
+        for _ in range(self.leaves):
+            made = []
+            try:
+                leaf = self._descend(board, root, made)
+                if leaf.winner is None:
+                    stones.append((board.stones_of(1), board.stones_of(2)))
+            finally:
+                for _ in made:
+                    board.undo_move()
+            self.playouts += per_leaf
+            if leaf.winner is None:
+                pending.append(leaf)
+            else:
+                value = 0.5 * per_leaf if leaf.winner == 0 else (
+                    per_leaf if leaf.winner == leaf.player else 0.0)
+                self._backup(leaf, value)
+        if not pending:
+            return
+
+        to_move = np.array([3 - leaf.player for leaf in pending])
+        origin, size = rollout_window(board, stones)
+        starts = np.stack([padded(start, origin, size) for start in stones])
+        wins, draws = rollouts(starts, to_move, per_leaf, size, rng)
+        for leaf, won, drawn in zip(pending, wins.tolist(), draws.tolist()):
+            # `won` counts games won by the player to move, not leaf.player
+            self._backup(leaf, per_leaf - won - drawn + 0.5 * drawn)
+
+    def _descend(self, board: Board, root: Node, made: List[Tuple[int, int]]) -> Node:
+        """Walk from `root` to a new or terminal leaf, making its moves on
+        `board` (and listing them in `made`) and adding a virtual loss
+        along the way."""
+        per_leaf = self.playouts_per_leaf
+        node = root
+        node.visits += per_leaf
+        while node.winner is None:
+            if node.untried is None:
+                node.untried = self._candidates(board, node)
+            limit = math.ceil(WIDEN_C * (node.visits / per_leaf) ** WIDEN_ALPHA)
+            if node.untried and len(node.children) < limit:
+                (x, y), prior = node.untried.pop(0)
+                mover = 3 - node.player
+                board.make_move(x, y, mover)
+                made.append((x, y))
+                child = Node((x, y), mover, node, board.hash, prior)
+                if board.check_win_at(x, y, mover):
+                    child.winner = mover
+                elif board.is_full():
+                    child.winner = 0
+                node.children.append(child)
+                child.visits += per_leaf
+                return child
+            if not node.children:
+                node.winner = 0  # No moves left
+                break
+            node = self._select(node)
+            board.make_move(*node.move, node.player)
+            made.append(node.move)
+            node.visits += per_leaf
+        return node
+
+    def _backup(self, leaf: Node, value: float) -> None:
+        """Add `value` (playouts won by leaf.player) up the path; the
+        visits were counted on the way down."""
+        per_leaf = self.playouts_per_leaf
+        node = leaf
+        while node is not None:
+            node.wins += value
+            value = per_leaf - value  # The parent's player is the other one
+            node = node.parent
+
+    def _select(self, node: Node) -> Node:
+        log_visits = math.log(node.visits)
+        c = self.exploration
+        per_leaf = self.playouts_per_leaf
+        return max(node.children,
+                   key=lambda child: (child.wins / child.visits
+                                      + c * math.sqrt(log_visits / child.visits)
+                                      + PRIOR_WEIGHT * child.prior * per_leaf / child.visits))
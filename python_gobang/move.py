@@ -3,6 +3,7 @@ from dataclasses import dataclass
 
 @dataclass
 class Move:
+    __slots__ = ('x', 'y', 'player')
     x: int
     y: int
     player: int
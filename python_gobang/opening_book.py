@@ -0,0 +1,252 @@
+# src/python_gobang/opening_book.py
+"""Opening book keyed by symmetry-canonical position hashes.
+
+A book file is a 16-byte header followed by fixed-size entries sorted
+by key, so lookups memory-map the file and binary-search it without
+reading it all:
+
+    header: magic b'GOBOOK1\\0', board size (uint16), entry count (uint32),
+            2 reserved bytes
+    entry:  canonical key (uint64), move as x * size + y in canonical
+            orientation (uint16), weight (uint16)
+
+Build or extend a book offline with
+
+    python -m python_gobang.opening_book book.bin --selfplay 200
+    python -m python_gobang.opening_book book.bin --records arena.jsonl
+"""
+import argparse
+import json
+import mmap
+import os
+import random
+import struct
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .board import Board, zobrist_keys
+
+MAGIC = b'GOBOOK1\0'
+_HEADER = struct.Struct('<8sHI2x')
+_ENTRY = struct.Struct('<QHH')
+_MAX_WEIGHT = 0xFFFF
+
+# The eight symmetries of a square board, as functions of (x, y, n - 1)
+_SYMMETRIES = [
+    lambda x, y, m: (x, y),
+    lambda x, y, m: (y, m - x),
+    lambda x, y, m: (m - x, m - y),
+    lambda x, y, m: (m - y, x),
+    lambda x, y, m: (x, m - y),
+    lambda x, y, m: (m - x, y),
+    lambda x, y, m: (y, x),
+    lambda x, y, m: (m - y, m - x),
+]
+# _INVERSE[t] undoes _SYMMETRIES[t]
+_INVERSE = [0, 3, 2, 1, 4, 5, 6, 7]
+
+
+def canonical_key(board: Board) -> Tuple[int, int]:
+    """(key, symmetry) where key is the smallest Zobrist hash over all
+    eight symmetries of the position and symmetry is the one that gives it."""
+    keys = zobrist_keys(board.size)
+    stride, last = board.size + 1, board.size - 1
+    stones = [(board.stones_of(p), keys[p]) for p in (1, 2)]
+    best = None
+    for t, transform in enumerate(_SYMMETRIES):
+        h = 0
+        for cells, player_keys in stones:
+            for x, y in cells:
+                tx, ty = transform(x, y, last)
+                h ^= player_keys[tx * stride + ty]
+        if best is None or h < best[0]:
+            best = (h, t)
+    return best
+
+
+def to_canonical(move: Tuple[int, int], symmetry: int, size: int) -> Tuple[int, int]:
+    return _SYMMETRIES[symmetry](move[0], move[1], size - 1)
+
+
+def from_canonical(move: Tuple[int, int], symmetry: int, size: int) -> Tuple[int, int]:
+    return _SYMMETRIES[_INVERSE[symmetry]](move[0], move[1], size - 1)
+
+
+class OpeningBook:
+    """Read-only, memory-mapped opening book."""
+
+    def __init__(self, path: str, max_stones: int = 12):
+        self.path = path
+        self.max_stones = max_stones  # Positions with more stones aren't looked up
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.size, self.entries = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not an opening book")
+        self.hits = 0
+        self.misses = 0
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def _entry(self, i: int) -> Tuple[int, int, int]:
+        return _ENTRY.unpack_from(self._map, _HEADER.size + i * _ENTRY.size)
+
+    def moves(self, key: int) -> List[Tuple[int, int]]:
+        """(encoded canonical move, weight) for `key`, best first."""
+        lo, hi = 0, self.entries
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._entry(mid)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        found = []
+        while lo < self.entries:
+            entry_key, move, weight = self._entry(lo)
+            if entry_key != key:
+                break
+            found.append((move, weight))
+            lo += 1
+        return found
+
+    def lookup(self, board: Board) -> Optional[Tuple[int, int]]:
+        """Highest-weight book move for `board`, or None."""
+        if board.size != self.size or board.stones > self.max_stones:
+            return None
+        key, symmetry = canonical_key(board)
+        for move, _ in self.moves(key):
+            x, y = from_canonical(divmod(move, self.size), symmetry, self.size)
+            if board.is_valid_move(x, y):
+                self.hits += 1
+                return x, y
+        self.misses += 1
+        return None
+
+
+class BookBuilder:
+    """Accumulates weighted book moves and writes them as a sorted book file."""
+
+    def __init__(self, size: int = 15):
+        self.size = size
+        self.weights: Dict[int, Dict[int, int]] = {}
+
+    @classmethod
+    def from_book(cls, path: str) -> 'BookBuilder':
+        """Start from the contents of an existing book, to extend it."""
+        book = OpeningBook(path)
+        builder = cls(book.size)
+        try:
+            for i in range(book.entries):
+                key, move, weight = book._entry(i)
+                builder.weights.setdefault(key, {})[move] = weight
+        finally:
+            book.close()
+        return builder
+
+    def add(self, board: Board, move: Tuple[int, int], weight: int = 1) -> None:
+        key, symmetry = canonical_key(board)
+        x, y = to_canonical(move, symmetry, self.size)
+        moves = self.weights.setdefault(key, {})
+        encoded = x * self.size + y
+        moves[encoded] = min(_MAX_WEIGHT, moves.get(encoded, 0) + weight)
+
+    def add_game(self, moves: Iterable[Tuple[int, int]], plies: int,
+                 player: Optional[int] = None) -> None:
+        """Add the first `plies` moves of a game, only `player`'s if given."""
+        board = Board(self.size)
+        current = 1
+        for ply, (x, y) in enumerate(moves):
+            if ply >= plies:
+                break
+            if player is None or current == player:
+                self.add(board, (x, y))
+            board.place_piece(x, y, current)
+            current = 3 - current
+
+    def write(self, path: str) -> int:
+        """Write the book atomically; return the number of entries."""
+        entries = sorted((key, -weight, move)
+                         for key, moves in self.weights.items()
+                         for move, weight in moves.items())
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, self.size, len(entries)))
+            for key, neg_weight, move in entries:
+                f.write(_ENTRY.pack(key, move, -neg_weight))
+        os.replace(tmp, path)
+        return len(entries)
+
+
+def _selfplay_games(games: int, plies: int, size: int, time_budget: float,
+                    random_plies: int, seed: int):
+    """Yield HARD self-play openings that start from `random_plies` random moves."""
+    from .ai import AI, Difficulty
+
+    rng = random.Random(seed)
+    for _ in range(games):
+        board = Board(size)
+        ais = {1: AI(Difficulty.HARD, 1, time_budget=time_budget),
+               2: AI(Difficulty.HARD, 2, time_budget=time_budget)}
+        centre = size // 2
+        moves = []
+        player = 1
+        for ply in range(plies):
+            if ply == 0:
+                x, y = centre, centre
+            elif ply < random_plies:
+                x, y = rng.choice(sorted(board.frontier(1)))
+            else:
+                x, y = ais[player].get_move(board)
+            board.place_piece(x, y, player)
+            moves.append((x, y))
+            player = 3 - player
+        # Only the searched moves are book moves
+        yield moves, random_plies
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m python_gobang.opening_book',
+                                     description="Build or extend an opening book.")
+    parser.add_argument('book', help="Book file to write (extended if it exists)")
+    parser.add_argument('--size', type=int, default=15)
+    parser.add_argument('--plies', type=int, default=10,
+                        help="Moves from the start of each game to add")
+    parser.add_argument('--selfplay', type=int, default=0,
+                        help="Number of HARD self-play games to add")
+    parser.add_argument('--time-budget', type=float, default=1.0,
+                        help="HARD seconds per move in self-play")
+    parser.add_argument('--random-plies', type=int, default=2,
+                        help="Random opening moves before self-play searches")
+    parser.add_argument('--records', help="Arena JSON-lines file; winners' moves are added")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.book):
+        builder = BookBuilder.from_book(args.book)
+    else:
+        builder = BookBuilder(args.size)
+
+    if args.records:
+        with open(args.records) as f:
+            for line in f:
+                record = json.loads(line)
+                if record['winner']:
+                    builder.add_game(record['moves'], args.plies, record['winner'])
+
+    for moves, skip in _selfplay_games(args.selfplay, args.plies, builder.size,
+                                       args.time_budget, args.random_plies, args.seed):
+        board = Board(builder.size)
+        for ply, (x, y) in enumerate(moves):
+            player = 1 if ply % 2 == 0 else 2
+            if ply >= max(1, skip):
+                builder.add(board, (x, y))
+            board.place_piece(x, y, player)
+
+    count = builder.write(args.book)
+    print(f"Wrote {count} entries for {len(builder.weights)} positions to {args.book}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# src/python_gobang/ponder.py
+import threading
+from typing import Dict, Optional, Tuple
+
+from .ai import AI
+from .board import Board
+from .search_stats import SearchStats
+
+
+class Ponderer:
+    """Searches on the human's time.
+
+    While the human thinks, a background thread takes the human's most
+    likely replies one at a time and runs the AI's normal search on
+    each, which also fills the AI's transposition table. When the
+    human's move arrives, `stop` returns the AI's answer if that reply
+    was searched, waits for it if it is being searched, and otherwise
+    cancels the search in progress.
+
+    The thread works on its own copy of the board and is always joined
+    before `stop` returns, so the AI is never searched from two threads
+    at once. A threat-solver query already running when the search is
+    cancelled still finishes, which bounds the wait by its time limit.
+
+    Pondered searches use AI.search_move, so they leave the AI's `stats`
+    as they were and don't run its `search_callback`; `stop` does both,
+    with that search's figures, when it hands out a pondered answer.
+    """
+
+    def __init__(self, ai: AI, predictions: int = 3):
+        self.ai = ai
+        self.predictions = predictions  # Human replies searched per turn
+        self.hits = 0
+        self.misses = 0
+        self._thread: Optional[threading.Thread] = None
+        self._cancel = threading.Event()
+        # Human reply -> (AI's answer, that search's stats)
+        self._results: Dict[Tuple[int, int],
+                            Tuple[Tuple[int, int], Optional[SearchStats]]] = {}
+        self._current: Optional[Tuple[int, int]] = None
+        self._wanted: Optional[Tuple[int, int]] = None
+
+    def start(self, board: Board) -> None:
+        """Start pondering `board`, where it is the human's turn to move."""
+        self.stop(None)
+        self._cancel = threading.Event()
+        self._results = {}
+        self._current = None
+        self._wanted = None
+        self._thread = threading.Thread(target=self._run,
+                                        args=(Board.from_snapshot(board.snapshot()),),
+                                        name='ponder', daemon=True)
+        self._thread.start()
+
+    def _run(self, board: Board) -> None:
+        human = self.ai.opponent
+        for x, y in self.ai.likely_replies(board, self.predictions):
+            # Set _current before reading _wanted; stop() does the reverse
+            self._current = (x, y)
+            if self._wanted is not None or self._cancel.is_set():
+                break
+            board.make_move(x, y, human)
+            try:
+                if board.check_win_at(x, y, human):
+                    continue  # The game would be over
+                result = self.ai.search_move(board, cancel=self._cancel)
+            finally:
+                board.undo_move()
+            if not self._cancel.is_set():
+                self._results[(x, y)] = result
+        self._current = None
+
+    def stop(self, human_move: Optional[Tuple[int, int]]) -> Optional[Tuple[int, int]]:
+        """Stop pondering; return the AI's answer to `human_move` if it was searched."""
+        if self._thread is None:
+            return None
+        self._wanted = human_move
+        if human_move is None or self._current != human_move:
+            self._cancel.set()
+        self._thread.join()
+        self._thread = None
+        if human_move is None:
+            return None
+        result = self._results.get(human_move)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        move, stats = result
+        # This search is the one that made the move after all
+        self.ai.stats = stats
+        if self.ai.search_callback is not None:
+            self.ai.search_callback(self.ai, move, stats)
+        return move
@@ -0,0 +1,274 @@
+# src/python_gobang/records.py
+"""Compact binary game records.
+
+A record file is an 8-byte magic followed by records, each written with
+a single append:
+
+    size (uint8), black, white (uint8 player codes), result (uint8),
+    move count (uint16), then one byte per move (x * size + y), or two
+    little-endian bytes when size * size > 256
+
+A 40-move game on 15x15 takes 46 bytes. Files are only ever appended
+to. A record cut short by a crash is ignored when reading, and cut off
+when a writer next opens the file, so later records don't follow it.
+
+The text notation holds one game per line:
+
+    size=15 black=HUMAN white=HARD result=0-1 | 7,7 7,8 8,8 6,6
+
+with results written as in PGN: 1-0, 0-1, 1/2-1/2, or * if unfinished.
+
+    python -m python_gobang.records export games.rec games.txt
+    python -m python_gobang.records import games.txt games.rec
+    python -m python_gobang.records info games.rec
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Iterator, List, Optional, TextIO, Tuple
+
+MAGIC = b'GOREC1\0\0'
+_HEADER = struct.Struct('<BBBBH')
+
+# Player codes; unknown names are stored as OTHER
+PLAYER_CODES = {'HUMAN': 0, 'EASY': 1, 'MEDIUM': 2, 'HARD': 3, 'MCTS': 4, 'OTHER': 255}
+PLAYER_NAMES = {code: name for name, code in PLAYER_CODES.items()}
+
+# Result codes; 1 and 2 are the winning player
+UNFINISHED, BLACK_WINS, WHITE_WINS, DRAW = 0, 1, 2, 3
+RESULT_TEXT = {UNFINISHED: '*', BLACK_WINS: '1-0', WHITE_WINS: '0-1', DRAW: '1/2-1/2'}
+RESULT_CODES = {text: code for code, text in RESULT_TEXT.items()}
+
+
+@dataclass
+class GameRecord:
+    size: int = 15
+    moves: List[Tuple[int, int]] = field(default_factory=list)
+    black: str = 'HUMAN'
+    white: str = 'HUMAN'
+    result: int = UNFINISHED
+
+    @classmethod
+    def from_state(cls, state, size: int, black: str = 'HUMAN',
+                   white: str = 'HUMAN') -> 'GameRecord':
+        """Record of the game held by a GameState."""
+        from .game_state import GameStatus
+
+        status = state.get_status()
+        result = (state.get_winner() if status == GameStatus.WON else
+                  DRAW if status == GameStatus.DRAW else UNFINISHED)
+        return cls(size, [(m.x, m.y) for m in state.get_move_history()],
+                   black, white, result)
+
+    def encode(self) -> bytes:
+        count = len(self.moves)
+        if not 0 < self.size < 256 or count > 0xFFFF:
+            raise ValueError("size must be 1-255 and moves at most 65535")
+        header = _HEADER.pack(self.size, _player_code(self.black),
+                              _player_code(self.white), self.result, count)
+        cells = [x * self.size + y for x, y in self.moves]
+        if self.size * self.size <= 256:
+            return header + bytes(cells)
+        return header + struct.pack(f'<{count}H', *cells)
+
+    def to_text(self) -> str:
+        moves = ' '.join(f'{x},{y}' for x, y in self.moves)
+        return (f"size={self.size} black={self.black} white={self.white} "
+                f"result={RESULT_TEXT[self.result]} | {moves}").rstrip()
+
+    @classmethod
+    def from_text(cls, line: str) -> 'GameRecord':
+        tags, _, moves = line.partition('|')
+        fields = dict(tag.split('=', 1) for tag in tags.split())
+        try:
+            result = RESULT_CODES[fields.get('result', '*')]
+        except KeyError:
+            raise ValueError(f"Unknown result: {fields['result']!r}") from None
+        return cls(size=int(fields.get('size', 15)),
+                   moves=[tuple(map(int, move.split(','))) for move in moves.split()],
+                   black=fields.get('black', 'HUMAN'),
+                   white=fields.get('white', 'HUMAN'),
+                   result=result)
+
+
+@lru_cache(maxsize=None)
+def _cells(size: int) -> Tuple[Tuple[int, int], ...]:
+    """(x, y) of every encoded cell on a `size` board."""
+    return tuple(divmod(cell, size) for cell in range(size * size))
+
+
+def _player_code(name: str) -> int:
+    # Arena configs carry a budget, e.g. HARD:0.5
+    return PLAYER_CODES.get(name.partition(':')[0].upper(), PLAYER_CODES['OTHER'])
+
+
+class RecordWriter:
+    """Appends records to a record file, creating it if needed."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'ab')
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        else:
+            try:
+                with RecordReader(path) as reader:
+                    end = reader.complete_size()
+            except ValueError:
+                self._file.close()
+                raise
+            if end < self._file.tell():
+                # A torn record would swallow the ones appended after it
+                self._file.truncate(end)
+        self.written = 0
+
+    def write(self, record: GameRecord) -> None:
+        self._file.write(record.encode())
+        self.written += 1
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> 'RecordWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class RecordReader:
+    """Streams records from a memory-mapped record file.
+
+    Iterating decodes one record at a time, so files of any number of
+    games can be read in constant memory.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map: Optional[mmap.mmap] = None
+        if os.fstat(self._file.fileno()).st_size > len(MAGIC):
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._file.seek(0)
+        if self._file.read(len(MAGIC)) != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a game record file")
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> 'RecordReader':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _scan(self) -> Iterator[Tuple[Tuple[int, int, int, int, int], int, int]]:
+        """(header fields, offset of the moves, bytes per move) for every record."""
+        data = self._map
+        if data is None:
+            return
+        offset, end = len(MAGIC), len(data)
+        while offset + _HEADER.size <= end:
+            header = _HEADER.unpack_from(data, offset)
+            size, count = header[0], header[4]
+            width = 1 if size * size <= 256 else 2
+            moves_at = offset + _HEADER.size
+            offset = moves_at + count * width
+            if offset > end:
+                return  # Cut short by an interrupted write
+            yield header, moves_at, width
+
+    def complete_size(self) -> int:
+        """Bytes up to the end of the last complete record."""
+        end = len(MAGIC)
+        for (_, _, _, _, count), at, width in self._scan():
+            end = at + count * width
+        return end
+
+    def __iter__(self) -> Iterator[GameRecord]:
+        data = self._map
+        for (size, black, white, result, count), at, width in self._scan():
+            if width == 1:
+                cells = data[at:at + count]
+            else:
+                cells = struct.unpack_from(f'<{count}H', data, at)
+            yield GameRecord(size, list(map(_cells(size).__getitem__, cells)),
+                             PLAYER_NAMES.get(black, 'OTHER'),
+                             PLAYER_NAMES.get(white, 'OTHER'), result)
+
+    def summary(self) -> dict:
+        """Game, move and result counts, read from the headers alone."""
+        games = moves = 0
+        results = {text: 0 for text in RESULT_TEXT.values()}
+        for (_, _, _, result, count), _, _ in self._scan():
+            games += 1
+            moves += count
+            results[RESULT_TEXT.get(result, '*')] += 1
+        return {'games': games, 'moves': moves, 'results': results}
+
+
+def export_text(path: str, out: TextIO) -> int:
+    """Write every record in `path` to `out` in text notation."""
+    count = 0
+    with RecordReader(path) as reader:
+        for record in reader:
+            out.write(record.to_text() + '\n')
+            count += 1
+    return count
+
+
+def import_text(lines, path: str) -> int:
+    """Append the games in text notation from `lines` to `path`."""
+    count = 0
+    with RecordWriter(path) as writer:
+        for line in lines:
+            if line.strip() and not line.startswith('#'):
+                writer.write(GameRecord.from_text(line))
+                count += 1
+    return count
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m python_gobang.records',
+                                     description="Convert and inspect game record files.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    export = commands.add_parser('export', help="Binary records to text notation")
+    export.add_argument('records')
+    export.add_argument('text', nargs='?', help="Output file (default: stdout)")
+    imports = commands.add_parser('import', help="Text notation appended to binary records")
+    imports.add_argument('text')
+    imports.add_argument('records')
+    info = commands.add_parser('info', help="Count the games and results in a record file")
+    info.add_argument('records')
+    args = parser.parse_args(argv)
+
+    if args.command == 'export':
+        if args.text:
+            with open(args.text, 'w') as out:
+                count = export_text(args.records, out)
+            print(f"Exported {count} games to {args.text}")
+        else:
+            export_text(args.records, sys.stdout)
+    elif args.command == 'import':
+        with open(args.text) as lines:
+            count = import_text(lines, args.records)
+        print(f"Imported {count} games into {args.records}")
+    else:
+        with RecordReader(args.records) as reader:
+            summary = reader.summary()
+        results = ', '.join(f"{text} {n}" for text, n in summary['results'].items())
+        print(f"{summary['games']} games, {summary['moves']} moves ({results})")
+
+
+if __name__ == "__main__":
+    main()
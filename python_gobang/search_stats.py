@@ -0,0 +1,98 @@
+# src/python_gobang/search_stats.py
+import json
+import time
+from typing import Dict, List, Tuple
+
+# Search phases timed by SearchStats
+PHASES = ('movegen', 'ordering', 'evaluation')
+
+
+class SearchStats:
+    """Counters and phase timers for one AI.get_move call.
+
+    Filled in by the AI only when stats collection is on; with it off
+    the search never creates one.
+    """
+
+    def __init__(self):
+        self.nodes = 0
+        self.leaves = 0
+        self.cutoffs = 0
+        self.tt_hits = 0
+        self.tt_misses = 0
+        # Keyed by the remaining depth of the node:
+        # {'nodes', 'expanded', 'children', 'cutoffs'}
+        self.by_depth: Dict[int, Dict[str, int]] = {}
+        self.phase_seconds = {phase: 0.0 for phase in PHASES}
+        self.iterations: List[dict] = []
+        self.seconds = 0.0
+        self._start = time.perf_counter()
+
+    def _depth(self, depth: int) -> Dict[str, int]:
+        counters = self.by_depth.get(depth)
+        if counters is None:
+            counters = self.by_depth[depth] = {
+                'nodes': 0, 'expanded': 0, 'children': 0, 'cutoffs': 0}
+        return counters
+
+    def enter_node(self, depth: int) -> None:
+        self.nodes += 1
+        self._depth(depth)['nodes'] += 1
+
+    def leaf(self) -> None:
+        self.leaves += 1
+
+    def expanded(self, depth: int, children: int, cutoff: bool) -> None:
+        """Record an interior node that searched `children` moves."""
+        counters = self._depth(depth)
+        counters['expanded'] += 1
+        counters['children'] += children
+        if cutoff:
+            counters['cutoffs'] += 1
+            self.cutoffs += 1
+
+    def add_time(self, phase: str, started: float) -> None:
+        self.phase_seconds[phase] += time.perf_counter() - started
+
+    def iteration_done(self, depth: int, move: Tuple[int, int], score: float) -> None:
+        self.iterations.append({
+            'depth': depth,
+            'move': list(move),
+            'score': score,
+            'nodes': self.nodes,
+            'seconds': time.perf_counter() - self._start,
+        })
+
+    def finish(self, tt_hits: int = 0, tt_misses: int = 0) -> None:
+        self.seconds = time.perf_counter() - self._start
+        self.tt_hits = tt_hits
+        self.tt_misses = tt_misses
+
+    def branching_factor(self) -> float:
+        """Mean number of children searched per expanded node."""
+        expanded = sum(c['expanded'] for c in self.by_depth.values())
+        children = sum(c['children'] for c in self.by_depth.values())
+        return children / expanded if expanded else 0.0
+
+    def cutoff_rate(self) -> float:
+        expanded = sum(c['expanded'] for c in self.by_depth.values())
+        return self.cutoffs / expanded if expanded else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            'nodes': self.nodes,
+            'leaves': self.leaves,
+            'cutoffs': self.cutoffs,
+            'cutoff_rate': self.cutoff_rate(),
+            'branching_factor': self.branching_factor(),
+            'tt_hits': self.tt_hits,
+            'tt_misses': self.tt_misses,
+            'seconds': self.seconds,
+            'nodes_per_second': self.nodes / self.seconds if self.seconds else 0.0,
+            'phase_seconds': dict(self.phase_seconds),
+            'by_depth': {str(d): dict(c) for d, c in sorted(self.by_depth.items())},
+            'iterations': list(self.iterations),
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
@@ -0,0 +1,443 @@
+# src/python_gobang/server.py
+"""Multi-game server speaking line-delimited JSON.
+
+    python -m python_gobang.server --port 7777 --workers 4
+    python -m python_gobang.server --unix /tmp/gobang.sock
+
+Every request is one JSON object on one line and gets exactly one
+response line, in order. ``id`` is echoed back when given.
+
+    {"op": "new", "difficulty": "HARD", "size": 15, "ai_player": 2,
+     "time_budget": 0.5}                 -> {"ok": true, "game": 1, "ai_move": null, ...}
+    {"op": "move", "game": 1, "x": 7, "y": 7}
+                                         -> {"ok": true, "ai_move": [7, 8],
+                                             "status": "playing", "winner": 0}
+    {"op": "move", "game": 1}            -> retries the AI's move after a failure
+    {"op": "state", "game": 1}           -> moves, status and winner
+    {"op": "close", "game": 1}           -> forgets the game
+    {"op": "metrics"}                    -> sessions, queue depths, latencies
+
+A game belongs to the connection that created it and is forgotten when
+that connection closes. ``time_budget`` is in seconds, at most
+MAX_TIME_BUDGET, and is rounded to TIME_BUDGET_STEP.
+
+Failures answer {"ok": false, "error": "..."}. AI turns run in a
+process pool behind one bounded queue per difficulty; the queues share
+the workers by compute time, so cheap EASY and MEDIUM moves never wait
+behind a backlog of HARD searches. A full queue answers {"ok": false, "error": "busy"}
+straight away instead of queueing without limit.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from .ai import AI, Difficulty
+from .board import Board
+from .game_state import GameState, GameStatus
+from .move import Move
+
+# Latency samples kept per difficulty for the percentiles in `metrics`
+LATENCY_WINDOW = 1000
+# Longest per-move time budget a game may ask for, and the step budgets
+# are rounded to; workers keep an AI per budget, so this bounds their number
+MAX_TIME_BUDGET = 10.0
+TIME_BUDGET_STEP = 0.05
+
+
+class ServerBusy(Exception):
+    """Raised when a difficulty's queue is full."""
+
+
+class RequestError(Exception):
+    """Raised for a malformed or invalid request; the message goes to the client."""
+
+
+# AIs kept by each worker process, so transposition tables survive
+# from one move to the next
+_worker_ais: Dict[Tuple[Difficulty, int, Optional[float]], AI] = {}
+
+
+def _compute_move(difficulty: Difficulty, player: int, snapshot: Tuple[int, int, int],
+                  time_budget: Optional[float]) -> Tuple[int, int]:
+    """Worker-process side of AIPool: the AI's move on the snapshot board."""
+    key = (difficulty, player, time_budget)
+    ai = _worker_ais.get(key)
+    if ai is None:
+        ai = _worker_ais[key] = AI(difficulty, player=player, time_budget=time_budget)
+    return ai.get_move(Board.from_snapshot(snapshot))
+
+
+class QueueMetrics:
+    def __init__(self):
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.failed = 0
+        self.running = 0
+        self.wait_ms: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.total_ms: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def to_dict(self, depth: int) -> dict:
+        return {
+            'queued': depth,
+            'running': self.running,
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'rejected': self.rejected,
+            'failed': self.failed,
+            'wait_ms': _percentiles(self.wait_ms),
+            'latency_ms': _percentiles(self.total_ms),
+        }
+
+
+def _percentiles(samples) -> dict:
+    if not samples:
+        return {'p50': 0.0, 'p95': 0.0, 'p99': 0.0}
+    ordered = sorted(samples)
+    n = len(ordered)
+    return {f'p{q}': ordered[min(n - 1, n * q // 100)] for q in (50, 95, 99)}
+
+
+class AIPool:
+    """Runs AI moves in a process pool, fed from one queue per difficulty.
+
+    At most `workers` moves run at once. When a worker frees up, the
+    next move comes from the waiting difficulty that has used the least
+    worker time so far, so each difficulty with moves waiting gets an
+    equal share of the workers whatever its moves cost. A queue holding
+    `queue_limit` moves rejects new ones.
+    """
+
+    def __init__(self, workers: int = 1, queue_limit: int = 256):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+        self._queues: Dict[Difficulty, Deque] = {d: deque() for d in Difficulty}
+        self.metrics = {d: QueueMetrics() for d in Difficulty}
+        # Worker seconds used per difficulty
+        self._service = {d: 0.0 for d in Difficulty}
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._ready: Optional[asyncio.Event] = None
+        self._scheduler: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._slots = asyncio.Semaphore(self.workers)
+        self._ready = asyncio.Event()
+        self._scheduler = asyncio.ensure_future(self._schedule())
+
+    async def close(self) -> None:
+        if self._scheduler is not None:
+            self._scheduler.cancel()
+            try:
+                await self._scheduler
+            except asyncio.CancelledError:
+                pass
+        for queue in self._queues.values():
+            for _, future, _ in queue:
+                future.cancel()
+            queue.clear()
+        self._executor.shutdown(cancel_futures=True)
+
+    def submit(self, difficulty: Difficulty, player: int, board: Board,
+               time_budget: Optional[float]) -> 'asyncio.Future':
+        """Queue an AI move; the future resolves to its (x, y)."""
+        queue = self._queues[difficulty]
+        metrics = self.metrics[difficulty]
+        if self.full(difficulty):
+            metrics.rejected += 1
+            raise ServerBusy
+        if not queue and not metrics.running:
+            # Coming back from idle: don't bank the time spent idle
+            active = [self._service[d] for d in Difficulty
+                      if self._queues[d] or self.metrics[d].running]
+            if active:
+                self._service[difficulty] = max(self._service[difficulty], min(active))
+        future = asyncio.get_running_loop().create_future()
+        job = (difficulty, player, board.snapshot(), time_budget)
+        queue.append((job, future, time.perf_counter()))
+        metrics.submitted += 1
+        self._ready.set()
+        return future
+
+    def depth(self, difficulty: Difficulty) -> int:
+        return len(self._queues[difficulty])
+
+    def full(self, difficulty: Difficulty) -> bool:
+        return len(self._queues[difficulty]) >= self.queue_limit
+
+    async def _schedule(self) -> None:
+        while True:
+            await self._slots.acquire()
+            while not any(self._queues.values()):
+                self._ready.clear()
+                await self._ready.wait()
+            difficulty = min((d for d in Difficulty if self._queues[d]),
+                             key=self._service.__getitem__)
+            job, future, queued = self._queues[difficulty].popleft()
+            asyncio.ensure_future(self._run(difficulty, job, future, queued))
+
+    async def _run(self, difficulty: Difficulty, job, future, queued: float) -> None:
+        metrics = self.metrics[difficulty]
+        metrics.running += 1
+        started = time.perf_counter()
+        metrics.wait_ms.append((started - queued) * 1000)
+        try:
+            move = await asyncio.get_running_loop().run_in_executor(
+                self._executor, _compute_move, *job)
+        except Exception as e:
+            metrics.failed += 1
+            if not future.done():
+                future.set_exception(e)
+        else:
+            self._service[difficulty] += time.perf_counter() - started
+            metrics.completed += 1
+            metrics.total_ms.append((time.perf_counter() - queued) * 1000)
+            if not future.done():
+                future.set_result(move)
+        finally:
+            metrics.running -= 1
+            self._slots.release()
+
+
+class Session:
+    """One game: board, state and the AI side's settings."""
+
+    def __init__(self, difficulty: Difficulty, size: int, ai_player: int,
+                 time_budget: Optional[float]):
+        self.board = Board(size)
+        self.state = GameState()
+        self.difficulty = difficulty
+        self.ai_player = ai_player
+        self.time_budget = time_budget
+        self.moves: List[Tuple[int, int]] = []
+        self.thinking = False  # An AI move is queued or running
+
+    def play(self, x: int, y: int) -> None:
+        player = self.state.get_current_player()
+        self.board.make_move(x, y, player)
+        self.state.update_state(Move(x, y, player))
+        self.moves.append((x, y))
+        if self.board.check_win_at(x, y, player):
+            self.state.set_winner(player)
+        elif self.board.is_full():
+            self.state.set_draw()
+        else:
+            self.state.switch_player()
+
+    def ai_to_move(self) -> bool:
+        return (self.state.get_status() == GameStatus.PLAYING
+                and self.state.get_current_player() == self.ai_player)
+
+    def result(self) -> dict:
+        return {'status': self.state.get_status().name.lower(),
+                'winner': self.state.get_winner() or 0}
+
+
+class GameServer:
+    def __init__(self, workers: int = 1, queue_limit: int = 256,
+                 max_sessions: int = 10000):
+        self.pool = AIPool(workers, queue_limit)
+        self.max_sessions = max_sessions
+        self.sessions: Dict[int, Session] = {}
+        self._next_id = 1
+        self.connections = 0
+        self.requests = 0
+
+    async def start(self, host: str = '127.0.0.1', port: int = 7777,
+                    unix_path: Optional[str] = None) -> asyncio.AbstractServer:
+        self.pool.start()
+        if unix_path is not None:
+            return await asyncio.start_unix_server(self._handle, path=unix_path)
+        return await asyncio.start_server(self._handle, host, port)
+
+    async def close(self) -> None:
+        await self.pool.close()
+
+    async def _handle(self, reader: asyncio.StreamReader,
+                      writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        games: Set[int] = set()  # Created on this connection and not closed
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                response = await self.handle_line(line, games)
+                writer.write(json.dumps(response).encode() + b'\n')
+                # Stop reading from a client that doesn't read its answers
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections -= 1
+            # Nobody can reach these games any more
+            for game_id in games:
+                self.sessions.pop(game_id, None)
+            writer.close()
+
+    async def handle_line(self, line: bytes, games: Optional[Set[int]] = None) -> dict:
+        """Answer one request line. `games` collects the ids of games it
+        creates and loses those it closes."""
+        self.requests += 1
+        if games is None:
+            games = set()
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise RequestError("request must be a JSON object")
+            request_id = request.get('id')
+            handler = getattr(self, '_op_' + str(request.get('op')), None)
+            if handler is None:
+                raise RequestError(f"unknown op: {request.get('op')!r}")
+            response = await handler(request, games)
+            response['ok'] = True
+        except ServerBusy:
+            response = {'ok': False, 'error': 'busy'}
+        except KeyError as e:
+            response = {'ok': False, 'error': f"missing field: {e}"}
+        except (RequestError, ValueError, TypeError) as e:
+            response = {'ok': False, 'error': str(e)}
+        if request_id is not None:
+            response['id'] = request_id
+        return response
+
+    def _session(self, request: dict) -> Session:
+        session = self.sessions.get(request.get('game'))
+        if session is None:
+            raise RequestError(f"no such game: {request.get('game')!r}")
+        return session
+
+    async def _ai_turn(self, session: Session) -> Optional[List[int]]:
+        if not session.ai_to_move():
+            return None
+        session.thinking = True
+        try:
+            x, y = await self.pool.submit(session.difficulty, session.ai_player,
+                                          session.board, session.time_budget)
+        except ServerBusy:
+            raise
+        except Exception as e:
+            raise RequestError(f"AI move failed: {e!r}") from e
+        finally:
+            session.thinking = False
+        session.play(x, y)
+        return [x, y]
+
+    async def _op_new(self, request: dict, games: Set[int]) -> dict:
+        if len(self.sessions) >= self.max_sessions:
+            raise RequestError("too many games")
+        try:
+            difficulty = Difficulty[str(request.get('difficulty', 'MEDIUM')).upper()]
+        except KeyError:
+            raise RequestError(f"unknown difficulty: {request.get('difficulty')!r}") from None
+        size = int(request.get('size', 15))
+        ai_player = int(request.get('ai_player', 2))
+        if not 5 <= size <= 25 or ai_player not in (1, 2):
+            raise RequestError("size must be 5-25 and ai_player 1 or 2")
+        if ai_player == 1 and self.pool.full(difficulty):
+            self.pool.metrics[difficulty].rejected += 1
+            raise ServerBusy
+        time_budget = request.get('time_budget')
+        if time_budget is not None:
+            time_budget = float(time_budget)
+            if not 0 < time_budget <= MAX_TIME_BUDGET:
+                raise RequestError(f"time_budget must be over 0 and at most {MAX_TIME_BUDGET}")
+            steps = max(1, round(time_budget / TIME_BUDGET_STEP))
+            time_budget = round(steps * TIME_BUDGET_STEP, 6)
+        session = Session(difficulty, size, ai_player, time_budget)
+        game_id = self._next_id
+        self._next_id += 1
+        self.sessions[game_id] = session
+        games.add(game_id)
+        try:
+            ai_move = await self._ai_turn(session)
+        except BaseException:
+            # The error goes out without the game's id, so no one could reach it
+            del self.sessions[game_id]
+            games.discard(game_id)
+            raise
+        return {'game': game_id, 'ai_move': ai_move, **session.result()}
+
+    async def _op_move(self, request: dict, games: Set[int]) -> dict:
+        session = self._session(request)
+        if session.thinking:
+            raise RequestError("the AI is still moving")
+        if session.state.get_status() != GameStatus.PLAYING:
+            raise RequestError("the game is over")
+        if session.ai_to_move():
+            # Only after a busy or failed AI turn: try the AI's move again
+            return {'ai_move': await self._ai_turn(session), **session.result()}
+        x, y = int(request['x']), int(request['y'])
+        if not session.board.is_valid_move(x, y):
+            raise RequestError("invalid move position")
+        if self.pool.full(session.difficulty):
+            # Refuse before playing, so the human move isn't left unanswered
+            self.pool.metrics[session.difficulty].rejected += 1
+            raise ServerBusy
+        session.play(x, y)
+        ai_move = await self._ai_turn(session)
+        return {'ai_move': ai_move, **session.result()}
+
+    async def _op_state(self, request: dict, games: Set[int]) -> dict:
+        session = self._session(request)
+        return {'moves': session.moves, 'size': session.board.size,
+                'difficulty': session.difficulty.name, 'ai_player': session.ai_player,
+                **session.result()}
+
+    async def _op_close(self, request: dict, games: Set[int]) -> dict:
+        self._session(request)
+        del self.sessions[request['game']]
+        games.discard(request['game'])
+        return {}
+
+    async def _op_metrics(self, request: dict, games: Set[int]) -> dict:
+        return self.metrics()
+
+    def metrics(self) -> dict:
+        return {
+            'sessions': len(self.sessions),
+            'connections': self.connections,
+            'requests': self.requests,
+            'workers': self.pool.workers,
+            'queues': {d.name: self.pool.metrics[d].to_dict(self.pool.depth(d))
+                       for d in Difficulty},
+        }
+
+
+async def serve(args) -> None:
+    server = GameServer(args.workers, args.queue_limit, args.max_sessions)
+    listener = await server.start(args.host, args.port, args.unix)
+    where = args.unix or f"{args.host}:{args.port}"
+    print(f"Serving on {where} with {args.workers} AI workers")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog='python -m python_gobang.server',
+                                     description="Serve Gobang games over line-delimited JSON.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=7777)
+    parser.add_argument('--unix', help="Listen on this Unix socket path instead of TCP")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--queue-limit', type=int, default=256,
+                        help="Queued AI moves per difficulty before answering 'busy'")
+    parser.add_argument('--max-sessions', type=int, default=10000)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,306 @@
+# src/python_gobang/sparse_board.py
+import re
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Pattern, Set, Tuple
+
+from .board import FRONTIER_RADII
+from .evaluator import SparsePatternEvaluator
+from .heatmap import threat_scores_at
+from .move import Move
+from .threat_index import FIVE, FOUR, SparseThreatIndex
+
+_DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+_MASK64 = (1 << 64) - 1
+
+# Characters of the line strings matched by SparseBoard.pattern_cells
+_OWN, _EMPTY, _OTHER, _OFF = 'x', '.', 'o', '#'
+
+
+@lru_cache(maxsize=None)
+def _pattern_table(patterns) -> Tuple[int, List[Tuple[Pattern, Dict[str, Tuple[int, ...]]]]]:
+    """Longest pattern length, and per pattern length a regex finding every
+    (overlapping) match plus {matched text: offsets of its '*' cells}."""
+    by_length: Dict[int, Dict[str, Tuple[int, ...]]] = {}
+    for pattern in patterns:
+        shape = pattern.replace('*', _EMPTY)
+        stars = tuple(j for j, ch in enumerate(pattern) if ch == '*')
+        table = by_length.setdefault(len(pattern), {})
+        table[shape] = tuple(sorted(set(table.get(shape, ()) + stars)))
+    regexes = [(re.compile('(?=(%s))' % '|'.join(map(re.escape, shapes))), shapes)
+               for _, shapes in sorted(by_length.items())]
+    return max(by_length), regexes
+
+
+@lru_cache(maxsize=None)
+def _offsets(radius: int) -> Tuple[Tuple[int, int], ...]:
+    return tuple((dx, dy) for dx in range(-radius, radius + 1)
+                 for dy in range(-radius, radius + 1))
+
+
+def _zobrist(player: int, x: int, y: int) -> int:
+    """Zobrist key of a stone, mixed from its coordinates (splitmix64)."""
+    z = ((x & 0xFFFFFF) << 26 | (y & 0xFFFFFF) << 2 | player) * 0x9E3779B97F4A7C15
+    z &= _MASK64
+    z = (z ^ (z >> 30)) * 0xBF58476D1CE4E5B9 & _MASK64
+    z = (z ^ (z >> 27)) * 0x94D049BB133111EB & _MASK64
+    return z ^ (z >> 31)
+
+
+class SparseBoard:
+    """Gobang board stored as a dict of stones, for large or unbounded play.
+
+    Offers the same interface as Board, so AI, ThreatSolver and the game
+    loop use either one unchanged, but memory and the cost of every move
+    grow with the number of stones rather than the board's area. With
+    `size` None the board is unbounded and coordinates may be any
+    integers, negative ones included.
+
+    Where Board hands out cell masks as bitboards (pattern_cells,
+    winning_cells, cell_mask), SparseBoard uses sets of (x, y). Both
+    support ``|``, ``&`` and truth tests, and both are read back with
+    cells_of.
+    """
+
+    def __init__(self, size: Optional[int] = None):
+        self.size = size
+        self.EMPTY = 0
+        self.directions = list(_DIRECTIONS)
+        self.cells: Dict[Tuple[int, int], int] = {}  # (x, y) -> player
+        self._by_player: List[Set[Tuple[int, int]]] = [set(), set(), set()]
+        self.stones = 0
+        self._undo: List[Tuple[int, int, int]] = []
+        self.hash = 0
+        self.evaluator = SparsePatternEvaluator(self)
+        self.threat_index = SparseThreatIndex(self)
+        self._reset_frontier()
+
+    def initialize(self) -> None:
+        self.cells = {}
+        self._by_player = [set(), set(), set()]
+        self.stones = 0
+        self._undo = []
+        self.hash = 0
+        self._reset_frontier()
+        self.evaluator.reset()
+        self.threat_index.reset()
+
+    def snapshot(self) -> Tuple[Optional[int], FrozenSet, FrozenSet]:
+        """Compact picklable copy: (size, player 1 cells, player 2 cells)."""
+        return self.size, frozenset(self._by_player[1]), frozenset(self._by_player[2])
+
+    @classmethod
+    def from_snapshot(cls, snapshot) -> 'SparseBoard':
+        size, black, white = snapshot
+        board = cls(size)
+        for player, cells in ((1, black), (2, white)):
+            for x, y in sorted(cells):
+                board.place_piece(x, y, player)
+        return board
+
+    def _reset_frontier(self) -> None:
+        # _near[r][cell]: stones within radius r of the cell, as in Board
+        self._near: Dict[int, Dict[Tuple[int, int], int]] = {r: {} for r in FRONTIER_RADII}
+        self._frontier: Dict[int, Set[Tuple[int, int]]] = {r: set() for r in FRONTIER_RADII}
+
+    def make_move(self, x: int, y: int, player: int) -> None:
+        """Play (x, y) for `player` so that undo_move can take it back."""
+        if not self.is_valid_move(x, y):
+            raise ValueError(f"Invalid move: ({x}, {y})")
+        self._place(x, y, player)
+        self._undo.append((x, y, player))
+
+    def undo_move(self) -> Tuple[int, int, int]:
+        """Take back the last make_move; return its (x, y, player)."""
+        if not self._undo:
+            raise IndexError("No move to undo")
+        move = self._undo.pop()
+        self._remove(*move)
+        return move
+
+    def last_move(self) -> Optional[Tuple[int, int, int]]:
+        return self._undo[-1] if self._undo else None
+
+    def place_piece(self, x: int, y: int, player: int) -> None:
+        """Set up a stone outside the undo stack; invalid cells are ignored."""
+        if self.is_valid_move(x, y):
+            self._place(x, y, player)
+
+    def remove_piece(self, x: int, y: int) -> None:
+        """Clear (x, y) outside the undo stack."""
+        player = self.cells.get((x, y), self.EMPTY)
+        if player != self.EMPTY:
+            self._remove(x, y, player)
+
+    def _place(self, x: int, y: int, player: int) -> None:
+        cell = (x, y)
+        self.cells[cell] = player
+        self._by_player[player].add(cell)
+        self.stones += 1
+        self.hash ^= _zobrist(player, x, y)
+        for r in FRONTIER_RADII:
+            near, frontier = self._near[r], self._frontier[r]
+            for dx, dy in _offsets(r):
+                n = (x + dx, y + dy)
+                count = near.get(n, 0) + 1
+                near[n] = count
+                if count == 1 and n not in self.cells and self._on_board(*n):
+                    frontier.add(n)
+            frontier.discard(cell)
+        self.evaluator.update(x, y, self.EMPTY, player)
+        self.threat_index.update(cell, player, True)
+
+    def _remove(self, x: int, y: int, player: int) -> None:
+        cell = (x, y)
+        del self.cells[cell]
+        self._by_player[player].discard(cell)
+        self.stones -= 1
+        self.hash ^= _zobrist(player, x, y)
+        for r in FRONTIER_RADII:
+            near, frontier = self._near[r], self._frontier[r]
+            for dx, dy in _offsets(r):
+                n = (x + dx, y + dy)
+                count = near[n] - 1
+                if count:
+                    near[n] = count
+                else:
+                    del near[n]
+                    frontier.discard(n)
+            if cell in near:
+                frontier.add(cell)
+        self.evaluator.update(x, y, player, self.EMPTY)
+        self.threat_index.update(cell, player, False)
+
+    def _on_board(self, x: int, y: int) -> bool:
+        return self.size is None or (0 <= x < self.size and 0 <= y < self.size)
+
+    def is_valid_move(self, x: int, y: int) -> bool:
+        return self._on_board(x, y) and (x, y) not in self.cells
+
+    def get_cell(self, x: int, y: int) -> int:
+        return self.cells.get((x, y), self.EMPTY)
+
+    def cell_at(self, x: int, y: int) -> int:
+        """get_cell, but -1 off the board."""
+        if self.size is not None and not (0 <= x < self.size and 0 <= y < self.size):
+            return -1
+        return self.cells.get((x, y), self.EMPTY)
+
+    def center(self) -> Tuple[int, int]:
+        """Where the first stone goes; the origin of an unbounded board."""
+        if self.size is None:
+            return 0, 0
+        return self.size // 2, self.size // 2
+
+    def heatmaps(self, cells) -> Dict[int, Dict[Tuple[int, int], float]]:
+        """heat[player][x, y] for each of `cells`, as threat_heatmaps scores them."""
+        return threat_scores_at(self.cell_at, cells)
+
+    def check_win(self, last_move: Move) -> bool:
+        return self.check_win_at(last_move.x, last_move.y, last_move.player)
+
+    def check_win_at(self, x: int, y: int, player: int) -> bool:
+        """Whether `player` has a five through (x, y)."""
+        cells = self.cells
+        for dx, dy in _DIRECTIONS:
+            count = 1
+            for sign in (1, -1):
+                i = 1
+                while cells.get((x + sign * i * dx, y + sign * i * dy)) == player:
+                    count += 1
+                    i += 1
+            if count >= 5:
+                return True
+        return False
+
+    def is_full(self) -> bool:
+        return self.size is not None and self.stones == self.size * self.size
+
+    def frontier(self, radius: int) -> Set[Tuple[int, int]]:
+        """Empty cells within `radius` (Chebyshev distance) of any stone.
+
+        `radius` must be one of FRONTIER_RADII. The set is live board
+        state: copy it before placing or removing pieces while iterating.
+        """
+        return self._frontier[radius]
+
+    def pattern_cells(self, player: int, patterns) -> Set[Tuple[int, int]]:
+        """The '*' cells of every match of `patterns` for `player`.
+
+        Every pattern holds one of the player's stones, so only the
+        stretches of line within a pattern's length of those stones are
+        read, once per direction, and matched as strings.
+        """
+        longest, regexes = _pattern_table(patterns)
+        reach = longest - 1
+        own = self._by_player[player]
+        cells = self.cells
+        size = self.size
+        found: Set[Tuple[int, int]] = set()
+        for dx, dy in _DIRECTIONS:
+            # Stones grouped by line: (first cell of the line, position on it)
+            lines: Dict[Tuple[int, int], List[int]] = {}
+            for x, y in own:
+                pos = x if dx else y
+                lines.setdefault((x - pos * dx, y - pos * dy), []).append(pos)
+            for (bx, by), positions in lines.items():
+                positions.sort()
+                # Merge the stretches [pos - reach, pos + reach] that overlap
+                spans = []
+                for pos in positions:
+                    if spans and pos - reach <= spans[-1][1] + 1:
+                        spans[-1][1] = pos + reach
+                    else:
+                        spans.append([pos - reach, pos + reach])
+                for first, last in spans:
+                    chars = []
+                    for pos in range(first, last + 1):
+                        x, y = bx + pos * dx, by + pos * dy
+                        cell = cells.get((x, y))
+                        if cell is not None:
+                            chars.append(_OWN if cell == player else _OTHER)
+                        elif size is None or (0 <= x < size and 0 <= y < size):
+                            chars.append(_EMPTY)
+                        else:
+                            chars.append(_OFF)
+                    line = ''.join(chars)
+                    for regex, shapes in regexes:
+                        for match in regex.finditer(line):
+                            pos = first + match.start()
+                            for j in shapes[match.group(1)]:
+                                found.add((bx + (pos + j) * dx, by + (pos + j) * dy))
+        return found
+
+    def winning_cells(self, player: int) -> Set[Tuple[int, int]]:
+        """The empty cells where `player` would complete five, from the
+        threat index.
+
+        The set is live board state: don't mutate it, and copy it (or
+        read it with cells_of) before placing or removing pieces.
+        """
+        return self.threat_index.masks[FIVE][player]
+
+    def four_cells(self, player: int) -> Set[Tuple[int, int]]:
+        """The empty cells where `player` would make a four, from the
+        threat index; live board state, like winning_cells."""
+        return self.threat_index.masks[FOUR][player]
+
+    def cell_mask(self, x: int, y: int) -> Set[Tuple[int, int]]:
+        """The mask holding only (x, y), to test against pattern_cells."""
+        return {(x, y)}
+
+    def has_multiple(self, mask: Set[Tuple[int, int]]) -> bool:
+        return len(mask) > 1
+
+    def stones_of(self, player: int) -> List[Tuple[int, int]]:
+        return sorted(self._by_player[player])
+
+    def empty_cells(self) -> List[Tuple[int, int]]:
+        """Every empty cell, or on an unbounded board those next to a stone."""
+        if self.size is None:
+            return sorted(self._frontier[1]) or [self.center()]
+        return [(x, y) for x in range(self.size) for y in range(self.size)
+                if (x, y) not in self.cells]
+
+    def cells_of(self, mask) -> List[Tuple[int, int]]:
+        """The cells of a mask, in the order Board.cells_of gives them."""
+        return sorted(mask) if mask else []
@@ -0,0 +1,174 @@
+# src/python_gobang/threat_index.py
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+_DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+# Kinds of threat cell: where a move completes five, and where it makes
+# a four (three stones and two gaps in a five-cell window). They are the
+# same cells as Board.pattern_cells finds for FIVE_PATTERNS and
+# FOUR_PATTERNS.
+FIVE, FOUR = 0, 1
+# Kind of threat made by a window holding this many stones of one player
+# and none of the other's
+_KIND = (None, None, None, FOUR, FIVE, None)
+
+# int.bit_count is Python 3.10+
+_popcount = getattr(int, 'bit_count', None) or (lambda v: bin(v).count('1'))
+
+
+@lru_cache(maxsize=None)
+def _window_masks(size: int) -> List[List[int]]:
+    """For each bit index, the masks of the five-cell windows through it."""
+    stride = size + 1
+    through: List[List[int]] = [[] for _ in range(size * stride)]
+    for dx, dy in _DIRECTIONS:
+        for x in range(size):
+            for y in range(size):
+                ex, ey = x + 4 * dx, y + 4 * dy
+                if not (0 <= ex < size and 0 <= ey < size):
+                    continue
+                window = [(x + k * dx) * stride + y + k * dy for k in range(5)]
+                mask = sum(1 << idx for idx in window)
+                for idx in window:
+                    through[idx].append(mask)
+    return through
+
+
+class ThreatIndex:
+    """Each player's five and four cells, kept up to date move by move.
+
+    Every five-cell window holding stones of only one player, three or
+    four of them, makes its empty cells four or five cells for that
+    player. The index counts per player how many windows vouch for each
+    cell, and the board calls `update` after each placement or removal,
+    which revisits only the (at most 20) windows through the changed
+    cell; stones in a window are counted straight from the bitboards.
+    `masks[kind][player]` is then always the current cell mask, so the
+    board answers winning_cells and four_cells without scanning.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.windows_through = _window_masks(board.size)
+        self.reset()
+
+    def reset(self) -> None:
+        cells = self.board.size * self.board.stride
+        # _votes[kind][player][idx]: windows making the cell a threat
+        self._votes = [[None, [0] * cells, [0] * cells] for _ in (FIVE, FOUR)]
+        self.masks = [[0, 0, 0] for _ in (FIVE, FOUR)]
+
+    def update(self, idx: int, player: int, placed: bool) -> None:
+        """Account for `player`'s stone at `idx` being placed or removed;
+        the board has already changed."""
+        bits = self.board.bits
+        own, other = bits[player], bits[3 - player]
+        empty = ~self.board.occupied
+        bit = 1 << idx
+        for window in self.windows_through[idx]:
+            n = _popcount(own & window)
+            m = _popcount(other & window)
+            if m:
+                # The other player's window is blocked by our first stone
+                # and freed when it goes
+                kind = _KIND[m]
+                if kind is not None:
+                    if placed and n == 1:
+                        self._vote(kind, 3 - player, window & empty | bit, -1)
+                    elif not placed and not n:
+                        self._vote(kind, 3 - player, window & empty, 1)
+                continue
+            old = n - 1 if placed else n + 1
+            kind = _KIND[old]
+            if kind is not None:
+                self._vote(kind, player, (window & empty | bit) if placed
+                           else window & empty & ~bit, -1)
+            kind = _KIND[n]
+            if kind is not None:
+                self._vote(kind, player, window & empty, 1)
+
+    def _vote(self, kind: int, player: int, cells: int, sign: int) -> None:
+        votes = self._votes[kind][player]
+        while cells:
+            low = cells & -cells
+            idx = low.bit_length() - 1
+            cells ^= low
+            votes[idx] += sign
+            if votes[idx] == (1 if sign > 0 else 0):
+                self.masks[kind][player] ^= low
+
+
+class SparseThreatIndex:
+    """ThreatIndex for SparseBoard: cells are (x, y) and masks are sets.
+
+    Windows are named by their first cell and direction and found on
+    the fly, skipping those that leave a bounded board, and the stones
+    of each player in them are counted in a dict.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.reset()
+
+    def reset(self) -> None:
+        # _stones[player][window]: that player's stones in the window
+        self._stones: List[Dict[Tuple[int, int, int], int]] = [{}, {}, {}]
+        self._votes: List[List[Dict[Tuple[int, int], int]]] = [
+            [{}, {}, {}] for _ in (FIVE, FOUR)]
+        self.masks = [[set(), set(), set()] for _ in (FIVE, FOUR)]
+
+    def update(self, cell: Tuple[int, int], player: int, placed: bool) -> None:
+        """Account for `player`'s stone at `cell` being placed or removed;
+        the board has already changed."""
+        own, other = self._stones[player], self._stones[3 - player]
+        stones = self.board.cells
+        size = self.board.size
+        x, y = cell
+        for d, (dx, dy) in enumerate(_DIRECTIONS):
+            for k in range(5):
+                sx, sy = x - k * dx, y - k * dy
+                if size is not None and not (0 <= sx < size and 0 <= sy < size
+                                             and 0 <= sx + 4 * dx < size
+                                             and 0 <= sy + 4 * dy < size):
+                    continue
+                window = (sx, sy, d)
+                old = own.get(window, 0)
+                n = old + 1 if placed else old - 1
+                if n:
+                    own[window] = n
+                else:
+                    del own[window]
+                m = other.get(window, 0)
+                if (m and old and n) or (not m and old < 3 and n < 3):
+                    continue  # Not a threat window before or after
+                empty = [c for c in ((sx + i * dx, sy + i * dy) for i in range(5))
+                         if c not in stones]
+                # `cell`'s state before the change differs from `empty`
+                before = empty + [cell] if placed else [c for c in empty if c != cell]
+                if m:
+                    kind = _KIND[m]
+                    if kind is not None:
+                        if placed and n == 1:
+                            self._vote(kind, 3 - player, before, -1)
+                        elif not placed and not n:
+                            self._vote(kind, 3 - player, empty, 1)
+                    continue
+                kind = _KIND[old]
+                if kind is not None:
+                    self._vote(kind, player, before, -1)
+                kind = _KIND[n]
+                if kind is not None:
+                    self._vote(kind, player, empty, 1)
+
+    def _vote(self, kind: int, player: int, cells: List[Tuple[int, int]], sign: int) -> None:
+        votes = self._votes[kind][player]
+        mask = self.masks[kind][player]
+        for cell in cells:
+            count = votes.get(cell, 0) + sign
+            if count:
+                votes[cell] = count
+            else:
+                del votes[cell]
+            if count == (1 if sign > 0 else 0):
+                mask ^= {cell}
@@ -0,0 +1,170 @@
+# src/python_gobang/threat_search.py
+import time
+from typing import Dict, Optional, Tuple
+
+from .board import (Board, OPEN_FOUR_PATTERNS, THREE_PATTERNS,
+                    THREE_DEFENCE_PATTERNS)
+
+
+class ThreatBudgetExceeded(Exception):
+    """Raised inside the solver when a query runs out of nodes or time."""
+
+
+class ThreatSolver:
+    """Threat-space search for forced wins.
+
+    VCF (victory by continuous fours) only lets the attacker play moves
+    that make a four, so the defender's reply is forced to the one cell
+    that completes it. VCT (victory by continuous threats) also allows
+    open threes, which the defender may answer at any cell that stops
+    the open four, or with a four of their own. A line is a win when the
+    attacker makes five, or makes two fives-to-be at once.
+
+    Both searches are sound but not complete: a counter-four must be
+    answered by a block that is itself a threat, otherwise the line
+    counts as refuted. Refuted positions are remembered by Zobrist hash
+    across queries. Each query stops after `max_nodes` nodes or
+    `time_limit` seconds and then reports no win.
+    """
+
+    def __init__(self, max_nodes: int = 20000, time_limit: Optional[float] = 0.25,
+                 vcf_depth: int = 12, vct_depth: int = 4):
+        self.max_nodes = max_nodes
+        self.time_limit = time_limit
+        self.vcf_depth = vcf_depth  # Attacker moves in a VCF line
+        self.vct_depth = vct_depth  # Attacker threes in a VCT line
+        self.nodes = 0
+        # (hash, attacker, kind) -> depth up to which the position is refuted
+        self._refuted: Dict[Tuple[int, int, str], int] = {}
+        self._deadline: Optional[float] = None
+
+    def find_vcf(self, board: Board, attacker: int,
+                 deadline: Optional[float] = None) -> Optional[Tuple[int, int]]:
+        """First move of a forced win by continuous fours, if one is found.
+
+        `deadline` is an optional ``time.perf_counter()`` value that cuts
+        the query short of its own time limit.
+        """
+        return self._query(board, attacker, self._vcf, self.vcf_depth, deadline)
+
+    def find_vct(self, board: Board, attacker: int,
+                 deadline: Optional[float] = None) -> Optional[Tuple[int, int]]:
+        """First move of a forced win by fours and open threes, if one is found."""
+        return self._query(board, attacker, self._vct, self.vct_depth, deadline)
+
+    def _query(self, board: Board, attacker: int, search, depth: int,
+               deadline: Optional[float]):
+        self.nodes = 0
+        self._deadline = (None if self.time_limit is None
+                          else time.perf_counter() + self.time_limit)
+        if deadline is not None:
+            self._deadline = deadline if self._deadline is None else min(deadline, self._deadline)
+        if len(self._refuted) > 1 << 18:
+            self._refuted.clear()
+        try:
+            return search(board, attacker, depth)
+        except ThreatBudgetExceeded:
+            return None
+
+    def _tick(self) -> None:
+        self.nodes += 1
+        if self.nodes > self.max_nodes:
+            raise ThreatBudgetExceeded
+        if self._deadline is not None and time.perf_counter() >= self._deadline:
+            raise ThreatBudgetExceeded
+
+    def _forced_moves(self, board: Board, attacker: int, threats: int) -> Optional[int]:
+        """Attacker moves to try, given the threat cells `threats`.
+
+        If the defender already has a four the attacker must block it,
+        and only a block that is also a threat keeps the line going.
+        Returns None when the attacker's turn is spent defending.
+        """
+        defender_wins = board.winning_cells(3 - attacker)
+        if not defender_wins:
+            return threats
+        if board.has_multiple(defender_wins):
+            return None  # Two fives-to-be can't both be blocked
+        return defender_wins & threats
+
+    def _vcf(self, board: Board, attacker: int, depth: int) -> Optional[Tuple[int, int]]:
+        self._tick()
+        wins = board.winning_cells(attacker)
+        if wins:
+            return board.cells_of(wins)[0]
+        if depth == 0:
+            return None
+        key = (board.hash, attacker, 'vcf')
+        if self._refuted.get(key, -1) >= depth:
+            return None
+
+        moves = self._forced_moves(board, attacker,
+                                   board.four_cells(attacker))
+        defender = 3 - attacker
+        for x, y in board.cells_of(moves or 0):
+            board.make_move(x, y, attacker)
+            try:
+                wins = board.winning_cells(attacker)
+                if board.has_multiple(wins):
+                    return x, y  # Two completing cells: the defender can't stop both
+                bx, by = board.cells_of(wins)[0]
+                board.make_move(bx, by, defender)
+                try:
+                    if self._vcf(board, attacker, depth - 1) is not None:
+                        return x, y
+                finally:
+                    board.undo_move()
+            finally:
+                board.undo_move()
+
+        self._refuted[key] = depth
+        return None
+
+    def _vct(self, board: Board, attacker: int, depth: int) -> Optional[Tuple[int, int]]:
+        self._tick()
+        move = self._vcf(board, attacker, self.vcf_depth)
+        if move is not None:
+            return move
+        if depth == 0:
+            return None
+        key = (board.hash, attacker, 'vct')
+        if self._refuted.get(key, -1) >= depth:
+            return None
+
+        fours = board.four_cells(attacker)
+        threes = board.pattern_cells(attacker, THREE_PATTERNS)
+        moves = self._forced_moves(board, attacker, fours | threes)
+        for x, y in board.cells_of(moves or 0):
+            board.make_move(x, y, attacker)
+            try:
+                if self._defences_fail(board, attacker, depth):
+                    return x, y
+            finally:
+                board.undo_move()
+
+        self._refuted[key] = depth
+        return None
+
+    def _defences_fail(self, board: Board, attacker: int, depth: int) -> bool:
+        """True if the attacker still wins against every defence to its last move."""
+        defender = 3 - attacker
+        wins = board.winning_cells(attacker)
+        if board.has_multiple(wins):
+            return True
+        if wins:
+            defences = wins
+        elif board.pattern_cells(attacker, OPEN_FOUR_PATTERNS):
+            # An open three: block the open four, or counter with a four
+            defences = (board.pattern_cells(attacker, THREE_DEFENCE_PATTERNS)
+                        | board.four_cells(defender))
+        else:
+            return False  # Not a threat after all
+
+        for x, y in board.cells_of(defences):
+            board.make_move(x, y, defender)
+            try:
+                if self._vct(board, attacker, depth - 1) is None:
+                    return False
+            finally:
+                board.undo_move()
+        return True
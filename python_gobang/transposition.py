@@ -0,0 +1,83 @@
+# src/python_gobang/transposition.py
+from dataclasses import dataclass
+from enum import Enum, auto
+from typing import List, Optional, Tuple
+
+
+class Bound(Enum):
+    EXACT = auto()
+    LOWER = auto()   # Failed high: true score >= stored score
+    UPPER = auto()   # Failed low: true score <= stored score
+
+
+@dataclass
+class TTEntry:
+    key: int
+    depth: int
+    score: float
+    bound: Bound
+    best_move: Optional[Tuple[int, int]]
+    generation: int
+
+
+class TranspositionTable:
+    """Fixed-size table of search results keyed by Zobrist hash.
+
+    Each bucket has two slots. The first keeps the deepest result seen
+    for the current search generation; the second always takes the most
+    recent store. Entries from earlier `get_move` calls stay usable but
+    are the first to be overwritten.
+    """
+
+    def __init__(self, capacity: int = 1 << 16):
+        self._buckets = max(1, capacity // 2)
+        self._slots: List[Optional[TTEntry]] = [None] * (self._buckets * 2)
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def new_search(self) -> None:
+        """Age existing entries so the next search prefers to replace them."""
+        self.generation += 1
+
+    def probe(self, key: int) -> Optional[TTEntry]:
+        base = (key % self._buckets) * 2
+        for entry in (self._slots[base], self._slots[base + 1]):
+            if entry is not None and entry.key == key:
+                self.hits += 1
+                return entry
+        self.misses += 1
+        return None
+
+    def store(self, key: int, depth: int, score: float, bound: Bound,
+              best_move: Optional[Tuple[int, int]]) -> None:
+        base = (key % self._buckets) * 2
+        deep = self._slots[base]
+        if (deep is None or deep.key == key or deep.generation != self.generation
+                or depth >= deep.depth):
+            slot = base
+        else:
+            slot = base + 1
+
+        old = self._slots[slot]
+        if old is not None and old.key != key:
+            self.evictions += 1
+        self._slots[slot] = TTEntry(key, depth, score, bound, best_move, self.generation)
+        self.stores += 1
+
+    def clear(self) -> None:
+        self._slots = [None] * len(self._slots)
+        self.generation = 0
+        self.hits = self.misses = self.stores = self.evictions = 0
+
+    def stats(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stores': self.stores,
+            'evictions': self.evictions,
+            'size': sum(entry is not None for entry in self._slots),
+            'capacity': len(self._slots),
+        }
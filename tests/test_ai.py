@@ -0,0 +1,83 @@
+import time
+
+from python_gobang.ai import AI, Difficulty
+from python_gobang.board import Board
+from python_gobang.sparse_board import SparseBoard
+
+
+class SlowSolver:
+    """Stands in for ThreatSolver: every query takes `delay` seconds, and
+    in the starting position the opponent has a VCF starting at `vcf`."""
+
+    def __init__(self, opponent, vcf, stones, delay):
+        self.opponent = opponent
+        self.vcf = vcf
+        self.stones = stones
+        self.delay = delay
+        self.queries = []
+
+    def find_vcf(self, board, attacker, deadline=None):
+        self.queries.append(('vcf', attacker, board.stones))
+        time.sleep(self.delay)
+        if attacker == self.opponent and board.stones == self.stones:
+            return self.vcf
+        return None
+
+    def find_vct(self, board, attacker, deadline=None):
+        self.queries.append(('vct', attacker, board.stones))
+        time.sleep(self.delay)
+        return None
+
+
+def test_threat_solver_time_per_hard_move_is_bounded():
+    board = Board(15)
+    for x, y, player in ((7, 7, 1), (7, 8, 2), (8, 8, 1), (6, 6, 2), (8, 6, 1)):
+        board.make_move(x, y, player)
+    ai = AI(Difficulty.HARD, player=2)
+    ai.HARD_DEPTH = 1
+    ai.THREAT_TIME = 0.2
+    solver = ai.threats = SlowSolver(1, (9, 5), board.stones, delay=0.05)
+
+    ai.get_move(board)
+
+    root_vcfs = [q for q in solver.queries
+                 if q == ('vcf', 1, board.stones)]
+    assert len(root_vcfs) == 1  # Asked once, not again before the defences
+    # Checking every defence would take about 17 queries; the deadline
+    # stops them after THREAT_TIME
+    assert len(solver.queries) <= 6
+
+
+def middlegame(board=None, shift=0):
+    board = Board(15) if board is None else board
+    moves = [(7, 7), (6, 8), (7, 8), (5, 8), (5, 7), (4, 9), (6, 7), (6, 6),
+             (8, 9), (5, 6), (9, 10), (10, 11), (11, 12), (4, 7)]
+    for i, (x, y) in enumerate(moves):
+        board.make_move(x + shift, y + shift, 1 + i % 2)
+    return board
+
+
+def test_breadth_cut_keeps_the_hottest_quiet_cells():
+    board = middlegame()
+    ai = AI(Difficulty.HARD, player=1)
+    ai._killers = [[None, None]]
+    candidates = ai._get_neighbor_moves(board, radius=1)
+    kept = ai._order_moves(board, list(candidates), 1, 0, None)
+
+    assert len(kept) == ai.BREADTH
+    # Quiet cells next to both players' runs, not the top-left ones
+    assert (6, 9) in kept and (6, 5) in kept
+    assert (4, 10) not in kept
+    assert ai._order_moves(board, list(reversed(candidates)), 1, 0, None) == kept
+
+
+def test_hard_plays_on_sparse_boards():
+    # Deep enough for quiescence to extend with three cells, which
+    # SparseBoard hands over as sets
+    moves = []
+    for board, shift in ((Board(15), 0), (SparseBoard(15), 0), (SparseBoard(), -60)):
+        ai = AI(Difficulty.HARD, player=1)
+        ai.HARD_DEPTH = 2
+        x, y = ai.get_move(middlegame(board, shift))
+        moves.append((x - shift, y - shift))
+    assert moves[0] == moves[1] == moves[2]
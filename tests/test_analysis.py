@@ -0,0 +1,34 @@
+from python_gobang.analysis import analyse_positions, read_positions
+
+
+def analyse(tmp_path, lines):
+    path = tmp_path / 'positions.jsonl'
+    path.write_text('\n'.join(lines) + '\n')
+    return list(analyse_positions(read_positions(str(path)), max_depth=1))
+
+
+def test_bad_lines_get_their_own_errors(tmp_path):
+    results = analyse(tmp_path, [
+        '{"id": "ok", "moves": [[7, 7]]}',
+        '{"moves": [[7, 7]',
+        '[[7, 7], [7, 8]]',
+        '',
+        '"size=15"',
+        '{"moves": [[7, 7], [7, 8]]}',
+    ])
+    assert [r['id'] for r in results] == ['ok', 2, 3, 5, 6]
+    assert [('error' in r) for r in results] == [False, True, True, True, False]
+    assert results[0]['to_move'] == 2 and results[0]['moves']
+    assert results[4]['to_move'] == 1 and results[4]['moves']
+
+
+def test_bad_board_size_is_that_positions_error(tmp_path):
+    results = analyse(tmp_path, [
+        '{"id": "zero", "size": 0, "moves": []}',
+        '{"id": "text", "size": "15", "moves": []}',
+        '{"id": "flag", "size": true, "moves": []}',
+        '{"id": "ok", "size": 9, "moves": [[4, 4]]}',
+    ])
+    assert [r['id'] for r in results] == ['zero', 'text', 'flag', 'ok']
+    assert all(r['error'].startswith('bad position: size') for r in results[:3])
+    assert 'error' not in results[3]
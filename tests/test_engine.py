@@ -0,0 +1,55 @@
+import io
+
+import pytest
+
+from python_gobang.engine import Engine
+
+
+def run(engine, *lines):
+    """The answer lines the engine sends for `lines`."""
+    engine.out.seek(0)
+    engine.out.truncate()
+    for line in lines:
+        engine.handle(line)
+    return engine.out.getvalue().splitlines()
+
+
+@pytest.mark.parametrize('size', [15, 40])
+def test_takeback_needs_a_stone_on_the_board(size):
+    engine = Engine(out=io.StringIO())
+    assert run(engine, f'START {size}') == ['OK']
+    for bad in ('-1,-1', f'{size},0', '0,-3', '7,7'):
+        answer, = run(engine, f'TAKEBACK {bad}')
+        assert answer.startswith('ERROR'), bad
+    run(engine, 'INFO timeout_turn 200')
+    reply, = run(engine, 'TURN 7,7')
+    assert run(engine, f'TAKEBACK {reply}', 'TAKEBACK 7,7') == ['OK', 'OK']
+    assert engine.board.stones == 0
+
+
+def test_bad_commands_are_answered_with_error():
+    engine = Engine(out=io.StringIO())
+    answer, = run(engine, 'TURN 7,7')
+    assert answer.startswith('ERROR')  # No game yet
+    run(engine, 'START 15', 'INFO timeout_turn 200')
+    for bad in ('TURN seven,7', 'TURN 7', 'TURN 15,0', 'INFO timeout_turn soon', 'START 3'):
+        answer, = run(engine, bad)
+        assert answer.startswith('ERROR'), bad
+    run(engine, 'TURN 7,7')
+    answer, = run(engine, 'TURN 7,7')
+    assert answer.startswith('ERROR')  # Occupied
+
+
+def test_failed_search_still_plays_a_move():
+    engine = Engine(out=io.StringIO())
+    run(engine, 'START 15')
+
+    def failing_get_move(*args, **kwargs):
+        raise RuntimeError('search blew up')
+
+    engine.ai.get_move = failing_get_move
+    message, move = run(engine, 'TURN 7,7')
+    assert message.startswith('MESSAGE') and 'search blew up' in message
+    x, y = map(int, move.split(','))
+    assert engine.board.get_cell(x, y) == 1
+    assert engine.board.stones == 2
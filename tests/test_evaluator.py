@@ -0,0 +1,99 @@
+import random
+
+import pytest
+
+from python_gobang.board import Board
+from python_gobang.sparse_board import SparseBoard
+
+DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+# The baseline AI._PATTERN_SCORES, copied so the reference shares
+# nothing with the evaluator under test
+BASELINE_SCORES = {
+    5: 100000,
+    4: {'open': 10000, 'half': 1000},
+    3: {'open': 1000, 'half': 100},
+    2: {'open': 100, 'half': 10},
+}
+
+
+# The per-stone scan the AI used before the evaluator was incremental
+# (AI._count_direction and AI._evaluate_board), kept here as an
+# independent reference for the incremental totals.
+def count_direction(board, x, y, dx, dy, player):
+    """Stones of `player` next to (x, y) along +-(dx, dy), up to four
+    each way, and how many of the two ends are open."""
+    count = 0
+    open_ends = 0
+    for sign in (1, -1):
+        for i in range(1, 5):
+            nx, ny = x + sign * dx * i, y + sign * dy * i
+            if board.size is not None and not (0 <= nx < board.size and 0 <= ny < board.size):
+                break
+            cell = board.get_cell(nx, ny)
+            if cell == player:
+                count += 1
+            elif cell == board.EMPTY:
+                open_ends += 1
+                break
+            else:
+                break
+    return count, open_ends
+
+
+def baseline_totals(board):
+    """Both players' scores, summed over every stone and direction."""
+    totals = [0, 0, 0]
+    for player in (1, 2):
+        for x, y in board.stones_of(player):
+            for dx, dy in DIRECTIONS:
+                count, open_ends = count_direction(board, x, y, dx, dy, player)
+                total = count + 1
+                if total >= 5:
+                    totals[player] += BASELINE_SCORES[5]
+                elif open_ends > 0 and total >= 2:
+                    kind = 'open' if open_ends == 2 else 'half'
+                    totals[player] += BASELINE_SCORES[min(total, 4)][kind]
+    return totals
+
+
+def random_walk(board, seed, steps=120, spread=4):
+    """Play random moves near the centre, undoing some, and check the
+    evaluator's totals against the per-stone scan after every step."""
+    rng = random.Random(seed)
+    cx, cy = board.center()
+    player = 1
+    for _ in range(steps):
+        if board.last_move() is not None and rng.random() < 0.3:
+            board.undo_move()
+            player = 3 - player
+        else:
+            x = cx + rng.randint(-spread, spread)
+            y = cy + rng.randint(-spread, spread)
+            if not board.is_valid_move(x, y):
+                continue
+            board.make_move(x, y, player)
+            player = 3 - player
+        assert board.evaluator.totals[1:] == baseline_totals(board)[1:]
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_board_totals_match_baseline(seed):
+    random_walk(Board(9), seed)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_bounded_sparse_board_totals_match_baseline(seed):
+    random_walk(SparseBoard(9), seed)
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_unbounded_sparse_board_totals_match_baseline(seed):
+    random_walk(SparseBoard(), seed)
+
+
+def test_totals_return_to_zero_after_undoing_everything():
+    for board in (Board(9), SparseBoard(9), SparseBoard()):
+        random_walk(board, seed=99, steps=60)
+        while board.last_move() is not None:
+            board.undo_move()
+        assert board.evaluator.totals[1:] == [0, 0]
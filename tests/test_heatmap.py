@@ -0,0 +1,20 @@
+import random
+
+import numpy as np
+
+from python_gobang.heatmap import threat_heatmaps, threat_heatmaps_at
+
+
+def test_scoring_listed_cells_matches_the_whole_board_pass():
+    rng = random.Random(3)
+    for size in (6, 9, 15, 19):
+        for _ in range(20):
+            grid = np.array([[rng.choice((0, 0, 0, 1, 2)) for _ in range(size)]
+                             for _ in range(size)])
+            cells = rng.sample([(x, y) for x in range(size) for y in range(size)],
+                               rng.randint(1, size * size))
+            full, listed = threat_heatmaps(grid), threat_heatmaps_at(grid, cells)
+            for x, y in cells:
+                assert listed[1][x, y] == full[1][x, y]
+                assert listed[2][x, y] == full[2][x, y]
+    assert not threat_heatmaps_at(grid, []).any()
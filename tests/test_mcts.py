@@ -0,0 +1,15 @@
+from python_gobang.mcts import MCTS
+from python_gobang.sparse_board import SparseBoard
+
+
+def test_search_on_an_unbounded_sparse_board():
+    board = SparseBoard()
+    for x, y, player in ((-40, -40, 1), (-40, -39, 2), (-39, -39, 1), (-38, -41, 2)):
+        board.make_move(x, y, player)
+    mcts = MCTS(player=1, leaves=8)
+
+    x, y = mcts.search(board, playouts=256)
+
+    assert board.is_valid_move(x, y)
+    assert (x, y) in board.frontier(1)
+    assert mcts.playouts >= 256
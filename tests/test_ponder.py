@@ -0,0 +1,59 @@
+import time
+
+from python_gobang.ai import AI, Difficulty
+from python_gobang.board import Board
+from python_gobang.ponder import Ponderer
+
+
+def pondering_ai():
+    board = Board(15)
+    for x, y, player in ((7, 7, 1), (7, 8, 2), (8, 8, 1)):
+        board.make_move(x, y, player)
+    ai = AI(Difficulty.HARD, player=2, collect_stats=True)
+    ai.HARD_DEPTH = 1
+    calls = []
+    ai.search_callback = lambda ai, move, stats: calls.append((move, stats))
+    ai.stats = earlier = object()  # Stands for the stats of the last real move
+    return board, ai, calls, earlier
+
+
+def ponder_until_searched(ponderer, board, replies=1):
+    ponderer.start(board)
+    deadline = time.perf_counter() + 30
+    while len(ponderer._results) < replies and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    assert len(ponderer._results) >= replies
+
+
+def test_pondered_searches_leave_stats_and_callback_alone():
+    board, ai, calls, earlier = pondering_ai()
+    ponderer = Ponderer(ai, predictions=2)
+    ponder_until_searched(ponderer, board)
+
+    assert calls == []
+    assert ai.stats is earlier
+
+
+def test_used_pondered_answer_reports_its_search():
+    board, ai, calls, earlier = pondering_ai()
+    ponderer = Ponderer(ai, predictions=2)
+    ponder_until_searched(ponderer, board)
+
+    reply = next(iter(ponderer._results))
+    move = ponderer.stop(reply)
+
+    assert move is not None
+    assert len(calls) == 1
+    assert calls[0][0] == move
+    assert ai.stats is calls[0][1] is not earlier
+    assert ai.stats.nodes > 0
+
+
+def test_missed_prediction_reports_nothing():
+    board, ai, calls, earlier = pondering_ai()
+    ponderer = Ponderer(ai, predictions=2)
+    ponder_until_searched(ponderer, board)
+
+    assert ponderer.stop((0, 0)) is None
+    assert calls == []
+    assert ai.stats is earlier
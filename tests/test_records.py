@@ -0,0 +1,48 @@
+from python_gobang.records import (BLACK_WINS, WHITE_WINS, GameRecord, RecordReader,
+                                   RecordWriter)
+
+GAMES = [
+    GameRecord(15, [(7, 7), (7, 8), (8, 8)], 'HUMAN', 'HARD', BLACK_WINS),
+    GameRecord(15, [(1, 1), (2, 2), (1, 0), (0, 2), (3, 3), (4, 4)], 'EASY', 'MCTS'),
+    GameRecord(19, [(0, 18), (18, 0)], 'MEDIUM', 'HARD', WHITE_WINS),
+    GameRecord(25, [(24, 24), (12, 12), (0, 1)], 'HARD', 'HARD'),
+]
+
+
+def read_all(path):
+    with RecordReader(path) as reader:
+        return list(reader)
+
+
+def test_records_round_trip(tmp_path):
+    path = str(tmp_path / 'games.rec')
+    with RecordWriter(path) as writer:
+        for game in GAMES:
+            writer.write(game)
+    assert read_all(path) == GAMES
+
+
+def test_torn_record_is_dropped_before_appending(tmp_path):
+    path = str(tmp_path / 'games.rec')
+    with RecordWriter(path) as writer:
+        writer.write(GAMES[0])
+    # A crash part way through appending the next record
+    with open(path, 'ab') as f:
+        f.write(GAMES[1].encode()[:-2])
+    assert read_all(path) == GAMES[:1]
+
+    with RecordWriter(path) as writer:
+        writer.write(GAMES[2])
+        writer.write(GAMES[3])
+    assert read_all(path) == [GAMES[0], GAMES[2], GAMES[3]]
+
+
+def test_torn_header_is_dropped_before_appending(tmp_path):
+    path = str(tmp_path / 'games.rec')
+    with RecordWriter(path) as writer:
+        writer.write(GAMES[0])
+    with open(path, 'ab') as f:
+        f.write(GAMES[1].encode()[:3])
+    with RecordWriter(path) as writer:
+        writer.write(GAMES[2])
+    assert read_all(path) == [GAMES[0], GAMES[2]]
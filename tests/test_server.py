@@ -0,0 +1,70 @@
+import asyncio
+import json
+
+from python_gobang.server import MAX_TIME_BUDGET, GameServer
+
+
+def request(server, games=None, **fields):
+    return asyncio.run(server.handle_line(json.dumps(fields).encode(), games))
+
+
+def test_time_budget_is_range_checked_and_rounded():
+    server = GameServer()
+    for bad in (0, -1, MAX_TIME_BUDGET + 1, 'nan', 'inf'):
+        response = request(server, op='new', time_budget=bad)
+        assert not response['ok'], bad
+    budgets = set()
+    for i in range(200):
+        response = request(server, op='new', time_budget=0.1 + i / 997)
+        budgets.add(server.sessions[response['game']].time_budget)
+    # 200 distinct requests share a handful of worker AIs
+    assert budgets == {0.1, 0.15, 0.2, 0.25, 0.3}
+
+
+def test_failed_first_ai_move_forgets_the_game():
+    server = GameServer()
+
+    def failing_submit(*args):
+        future = asyncio.get_running_loop().create_future()
+        future.set_exception(RuntimeError('worker died'))
+        return future
+
+    server.pool.submit = failing_submit
+    games = set()
+    response = request(server, games, op='new', ai_player=1)
+    assert not response['ok']
+    assert 'game' not in response
+    assert server.sessions == {}
+    assert games == set()
+
+
+def test_closed_games_leave_the_connection():
+    server = GameServer()
+    games = set()
+    game = request(server, games, op='new')['game']
+    assert games == {game}
+    assert request(server, games, op='close', game=game)['ok']
+    assert games == set()
+
+
+def test_games_are_dropped_when_their_connection_closes():
+    async def scenario():
+        server = GameServer()
+        listener = await server.start(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        for _ in range(3):
+            writer.write(b'{"op": "new"}\n')
+            assert json.loads(await reader.readline())['ok']
+        created = len(server.sessions)
+        writer.close()
+        await writer.wait_closed()
+        for _ in range(100):
+            if not server.sessions:
+                break
+            await asyncio.sleep(0.01)
+        listener.close()
+        await server.close()
+        return created, len(server.sessions)
+
+    assert asyncio.run(scenario()) == (3, 0)
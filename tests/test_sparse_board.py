@@ -0,0 +1,24 @@
+from python_gobang.board import FIVE_PATTERNS, FOUR_PATTERNS
+from python_gobang.sparse_board import SparseBoard
+from python_gobang.threat_index import FIVE, FOUR
+
+
+def test_threat_lookups_return_the_live_sets():
+    board = SparseBoard()
+    fives, fours = board.winning_cells(1), board.four_cells(1)
+    assert fives is board.threat_index.masks[FIVE][1]
+    assert fours is board.threat_index.masks[FOUR][1]
+
+    # Three in a row with the other player far away
+    for x, y, player in ((0, 0, 1), (-50, 50, 2), (0, 1, 1), (-50, 52, 2), (0, 2, 1)):
+        board.make_move(x, y, player)
+    # The sets taken before the moves follow them, with no copying
+    assert board.winning_cells(1) is fives and board.four_cells(1) is fours
+    assert fours == board.pattern_cells(1, FOUR_PATTERNS) == {(0, -2), (0, -1), (0, 3), (0, 4)}
+    assert not fives
+
+    board.make_move(0, 3, 1)
+    assert fives == board.pattern_cells(1, FIVE_PATTERNS) == {(0, -1), (0, 4)}
+    board.undo_move()
+    assert not fives
+    assert fours == board.pattern_cells(1, FOUR_PATTERNS)